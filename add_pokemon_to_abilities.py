@@ -1,49 +1,72 @@
-import json
+from data_store import DataStore
+from reverse_index import build_reverse_index
 
 # File paths
 POKEMON_DATA_FILE = './data/pokemon-data.json'
 ABILITIES_DATA_FILE = './data/abilities-data.json'
 
-def read_json_file(file_path):
-    """ Reads a JSON file and returns its content. """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+# Ability ID -> Pokémon that have the ability, each listed once
+POKEMON_WITH_ABILITY_INDEX = {
+    'keys': lambda pokemon_name, pokemon_info: [ability['id'] for ability in pokemon_info.get('abilities', [])],
+    'unique': True,
+}
 
-def update_abilities_with_pokemon(pokemon_data, abilities_data):
-    """ Updates abilities data with the Pokémon that have each ability and returns the updated data. """
-    for pokemon_name, pokemon_info in pokemon_data.items():
-        for ability in pokemon_info.get('abilities', []):
-            ability_id = ability['id']
-            matched = False
-            for ability_name, ability_data in abilities_data.items():
-                if ability_data['id'] == ability_id:
-                    matched = True
-                    if 'pokemon_with_ability' not in ability_data:
-                        ability_data['pokemon_with_ability'] = []
-                    ability_data['pokemon_with_ability'].append({
-                        'name': pokemon_name,
-                        'id': pokemon_info['id']
-                    })
-                    break
-            if not matched:
-                print(f"No matching ID found for ability: {ability['ability_name']}")
+def build_ability_index(abilities_data):
+    """ Maps each ability ID to its entry in the abilities data, keeping the first entry of an ID. """
+    ability_index = {}
+    for ability_data in abilities_data.values():
+        ability_index.setdefault(ability_data['id'], ability_data)
+    return ability_index
+
+def add_pokemon_with_ability(pokemon_data, abilities_data, pokemon_with_ability):
+    """ Adds a POKEMON_WITH_ABILITY_INDEX index to the abilities data and returns the updated data.
+
+    The lists are sorted by Pokémon ID and name.
+    """
+    ability_index = build_ability_index(abilities_data)
+    for ability_id, pokemon_list in pokemon_with_ability.items():
+        ability_data = ability_index.get(ability_id)
+        if ability_data is None:
+            continue
+        if 'pokemon_with_ability' not in ability_data:
+            ability_data['pokemon_with_ability'] = []
+        listed_pokemon = {(p['id'], p['name']) for p in ability_data['pokemon_with_ability']}
+        ability_data['pokemon_with_ability'].extend(
+            p for p in pokemon_list if (p['id'], p['name']) not in listed_pokemon
+        )
+        ability_data['pokemon_with_ability'].sort(key=lambda p: (p['id'], p['name']))
+
+    if pokemon_with_ability.keys() - ability_index.keys():
+        for pokemon_info in pokemon_data.values():
+            for ability in pokemon_info.get('abilities', []):
+                if ability['id'] not in ability_index:
+                    print(f"No matching ID found for ability: {ability['ability_name']}")
     return abilities_data
 
-def save_json_file(data, file_path):
-    """ Saves data to a JSON file. """
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
+def update_abilities_with_pokemon(pokemon_data, abilities_data):
+    """ Updates abilities data with the Pokémon that have each ability and returns the updated data.
 
-def main():
+    Each Pokémon is listed once per ability, even if it has the ability in several slots.
+    """
+    pokemon_with_ability = build_reverse_index(pokemon_data.items(), POKEMON_WITH_ABILITY_INDEX)
+    return add_pokemon_with_ability(pokemon_data, abilities_data, pokemon_with_ability)
+
+def run(store):
+    """ Adds the Pokémon that have each ability to the abilities data in the store. """
     # Load data from files
-    pokemon_data = read_json_file(POKEMON_DATA_FILE)
-    abilities_data = read_json_file(ABILITIES_DATA_FILE)
+    pokemon_data = store.load(POKEMON_DATA_FILE)
+    abilities_data = store.load(ABILITIES_DATA_FILE)
 
     # Update abilities data with the Pokémon that have them
     updated_abilities_data = update_abilities_with_pokemon(pokemon_data, abilities_data)
 
     # Save the updated abilities data back to the same file
-    save_json_file(updated_abilities_data, ABILITIES_DATA_FILE)
+    store.save(ABILITIES_DATA_FILE, updated_abilities_data)
+
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
 
 if __name__ == "__main__":
     main()
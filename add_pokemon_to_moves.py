@@ -1,51 +1,64 @@
-import json
+from data_store import DataStore
+from reverse_index import build_reverse_index
 
 # File paths
 POKEMON_DATA_FILE = './data/pokemon-data.json'
 MOVES_DATA_FILE = './data/moves-data.json'
 
-def read_json_file(file_path):
-    """ Reads a JSON file and returns its content. """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+# Move ID -> Pokémon that can learn the move, each listed once
+LEARNED_BY_POKEMON_INDEX = {
+    'keys': lambda pokemon_name, pokemon_info: [move['id'] for move in pokemon_info.get('moves', [])],
+    'unique': True,
+}
 
-def update_moves_with_pokemon(pokemon_data, moves_data):
-    """ Updates moves data with the Pokémon that can learn each move and returns the updated data. """
-    for pokemon_name, pokemon_info in pokemon_data.items():
-        for move in pokemon_info.get('moves', []):
-            move_id = move['id']
-            matched = False
-            for move_name, move_data in moves_data.items():
-                if move_data['id'] == move_id:
-                    matched = True
-                    # Check if the Pokémon is already in the list
-                    if 'learned_by_pokemon' not in move_data:
-                        move_data['learned_by_pokemon'] = []
-                    if not any(p['id'] == pokemon_info['id'] for p in move_data['learned_by_pokemon']):
-                        move_data['learned_by_pokemon'].append({
-                            'name': pokemon_name,
-                            'id': pokemon_info['id']
-                        })
-                    break
-            if not matched:
-                print(f"No matching ID found for move: {move['name']}")
+def build_move_index(moves_data):
+    """ Maps each move ID to its entry in the moves data, keeping the first entry of an ID. """
+    move_index = {}
+    for move_data in moves_data.values():
+        move_index.setdefault(move_data['id'], move_data)
+    return move_index
+
+def add_learned_by_pokemon(pokemon_data, moves_data, learned_by_pokemon):
+    """ Adds a LEARNED_BY_POKEMON_INDEX index to the moves data and returns the updated data. """
+    move_index = build_move_index(moves_data)
+    for move_id, pokemon_list in learned_by_pokemon.items():
+        move_data = move_index.get(move_id)
+        if move_data is None:
+            continue
+        if 'learned_by_pokemon' not in move_data:
+            move_data['learned_by_pokemon'] = []
+        # Check if the Pokémon is already in the list
+        listed_ids = {p['id'] for p in move_data['learned_by_pokemon']}
+        move_data['learned_by_pokemon'].extend(p for p in pokemon_list if p['id'] not in listed_ids)
+
+    if learned_by_pokemon.keys() - move_index.keys():
+        for pokemon_info in pokemon_data.values():
+            for move in pokemon_info.get('moves', []):
+                if move['id'] not in move_index:
+                    print(f"No matching ID found for move: {move['name']}")
     return moves_data
 
-def save_json_file(data, file_path):
-    """ Saves data to a JSON file. """
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
+def update_moves_with_pokemon(pokemon_data, moves_data):
+    """ Updates moves data with the Pokémon that can learn each move and returns the updated data. """
+    learned_by_pokemon = build_reverse_index(pokemon_data.items(), LEARNED_BY_POKEMON_INDEX)
+    return add_learned_by_pokemon(pokemon_data, moves_data, learned_by_pokemon)
 
-def main():
+def run(store):
+    """ Adds the Pokémon that can learn each move to the moves data in the store. """
     # Load data from files
-    pokemon_data = read_json_file(POKEMON_DATA_FILE)
-    moves_data = read_json_file(MOVES_DATA_FILE)
+    pokemon_data = store.load(POKEMON_DATA_FILE)
+    moves_data = store.load(MOVES_DATA_FILE)
 
     # Update moves data with the Pokémon that can learn them
     updated_moves_data = update_moves_with_pokemon(pokemon_data, moves_data)
 
     # Save the updated moves data back to the same file
-    save_json_file(updated_moves_data, MOVES_DATA_FILE)
+    store.save(MOVES_DATA_FILE, updated_moves_data)
+
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
 
 if __name__ == "__main__":
     main()
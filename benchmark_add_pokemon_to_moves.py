@@ -0,0 +1,75 @@
+import contextlib
+import copy
+import io
+import json
+import time
+
+from add_pokemon_to_moves import MOVES_DATA_FILE, POKEMON_DATA_FILE, update_moves_with_pokemon
+
+# Compares update_moves_with_pokemon with the linear scan it replaced, on the data
+# in ./data/ (run it from the same directory as the other scripts, after a build).
+ROUNDS = 3
+
+
+def legacy_update_moves_with_pokemon(pokemon_data, moves_data):
+    """ The previous version, scanning every move for every learnset entry. """
+    for pokemon_name, pokemon_info in pokemon_data.items():
+        for move in pokemon_info.get('moves', []):
+            move_id = move['id']
+            matched = False
+            for move_name, move_data in moves_data.items():
+                if move_data['id'] == move_id:
+                    matched = True
+                    if 'learned_by_pokemon' not in move_data:
+                        move_data['learned_by_pokemon'] = []
+                    if not any(p['id'] == pokemon_info['id'] for p in move_data['learned_by_pokemon']):
+                        move_data['learned_by_pokemon'].append({
+                            'name': pokemon_name,
+                            'id': pokemon_info['id']
+                        })
+                    break
+            if not matched:
+                print(f"No matching ID found for move: {move['name']}")
+    return moves_data
+
+
+def strip_learned_by(moves_data):
+    """ Removes earlier results so both versions start from the downloaded moves data. """
+    moves_data = copy.deepcopy(moves_data)
+    for move_data in moves_data.values():
+        move_data.pop('learned_by_pokemon', None)
+    return moves_data
+
+
+def time_update(update, pokemon_data, moves_data):
+    best_time = None
+    for _ in range(ROUNDS):
+        moves_copy = copy.deepcopy(moves_data)
+        # The unmatched move warnings are the same for both versions, so hide them.
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            result = update(pokemon_data, moves_copy)
+            elapsed = time.perf_counter() - start_time
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    return best_time, result
+
+
+def main():
+    with open(POKEMON_DATA_FILE, 'r', encoding='utf-8') as file:
+        pokemon_data = json.load(file)
+    with open(MOVES_DATA_FILE, 'r', encoding='utf-8') as file:
+        moves_data = strip_learned_by(json.load(file))
+
+    learnset_entries = sum(len(p.get('moves', [])) for p in pokemon_data.values())
+    print(f"{len(pokemon_data)} Pokémon, {len(moves_data)} moves, {learnset_entries} learnset entries")
+
+    legacy_time, legacy_result = time_update(legacy_update_moves_with_pokemon, pokemon_data, moves_data)
+    indexed_time, indexed_result = time_update(update_moves_with_pokemon, pokemon_data, moves_data)
+
+    print(f"Linear scan: {legacy_time * 1000:.1f} ms")
+    print(f"ID index:    {indexed_time * 1000:.1f} ms ({legacy_time / indexed_time:.0f}x faster)")
+    print(f"Same result: {legacy_result == indexed_result}")
+
+
+if __name__ == "__main__":
+    main()
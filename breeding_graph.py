@@ -0,0 +1,245 @@
+# Finds the breeding chains a Pokémon can get an egg move through.
+#
+# Species are the nodes of a graph and two species are joined when they share an
+# egg group. A chain [pokemon, parent, ..., source] ends with a species that learns
+# the move itself; every species in between has the move as an egg move, so it can
+# pass the move on. Chains are found with one breadth-first search per move that
+# starts from all of its sources at once, which gives every Pokémon that has the
+# move as an egg move its shortest chain to each source.
+
+MAX_CHAIN_LENGTH = 3  # Pokémon, one parent carrying the move and its source
+CANNOT_BREED_EGG_GROUP = "cannot-breed"
+
+
+def get_earliest_evolutions(pokemon_data):
+    """Maps every species in an evolution chain to the Pokémon it is first listed under.
+
+    Only the first branch of each chain is followed, so e.g. Vaporeon maps to Eevee
+    but Jolteon is left out and is its own earliest evolution.
+    """
+    earliest_evolutions = {}
+    for pokemon, data in pokemon_data.items():
+        evolution_chain = (data.get("evolution_chain") or {}).get("chain", {})
+        while evolution_chain:
+            species_name = evolution_chain.get("species", {}).get("name")
+            earliest_evolutions.setdefault(species_name, pokemon)
+            evolves_to = evolution_chain.get("evolves_to", [])
+            evolution_chain = evolves_to[0] if evolves_to else None
+    return earliest_evolutions
+
+
+def get_species_names(pokemon_data, egg_groups_data):
+    """Maps every Pokémon and form to the name of its species in the egg group data.
+
+    The default variety of a species has the ID of the species, which is how e.g.
+    basculin-blue-striped is found to be a basculin.
+    """
+    names_by_id = {
+        species["id"]: species["name"]
+        for egg_group in egg_groups_data.values()
+        for species in egg_group["pokemon_species"]
+        if "id" in species
+    }
+    species_names = {}
+    for pokemon, data in pokemon_data.items():
+        for variety in data.get("varieties") or []:
+            if variety.get("is_default") and variety.get("id") in names_by_id:
+                species_names[pokemon] = names_by_id[variety["id"]]
+    return species_names
+
+
+def get_learned_moves(pokemon_data):
+    """Returns the egg moves and the other moves of every Pokémon as name sets."""
+    egg_moves = {}
+    natural_moves = {}
+    for pokemon, data in pokemon_data.items():
+        egg_moves[pokemon] = set()
+        natural_moves[pokemon] = set()
+        for move in data.get("moves", []):
+            if move["type"] == "egg_moves":
+                egg_moves[pokemon].add(move["name"])
+            else:
+                natural_moves[pokemon].add(move["name"])
+    return egg_moves, natural_moves
+
+
+class BreedingGraph:
+    """Egg group compatibility of every species and the moves each one learns.
+
+    Species are named by their earliest evolution, as that is what eggs hatch as.
+    The chains of a move are found the first time they are asked for and kept. Only
+    the moves of the species are kept from the Pokémon data, so the graph is small
+    enough to hand to worker processes; pickling it leaves out the found chains.
+    """
+
+    def __init__(self, pokemon_data, egg_groups_data):
+        self.earliest_evolutions = get_earliest_evolutions(pokemon_data)
+        self.species_names = get_species_names(pokemon_data, egg_groups_data)
+        self.egg_moves, self.natural_moves = get_learned_moves(pokemon_data)
+
+        species_egg_groups = {}
+        for egg_group in egg_groups_data.values():
+            for species in egg_group["pokemon_species"]:
+                groups = species_egg_groups.setdefault(species["name"], [])
+                if egg_group["name"] not in groups:
+                    groups.append(egg_group["name"])
+
+        # Egg groups of every species as bits of an int, so two species can breed
+        # when their masks AND to non-zero
+        egg_group_bits = {}
+        self.egg_group_masks = {}
+        for species_name, groups in species_egg_groups.items():
+            mask = 0
+            for group in groups:
+                mask |= egg_group_bits.setdefault(group, 1 << len(egg_group_bits))
+            self.egg_group_masks[species_name] = mask
+
+        # Nodes in egg group order, each with the egg groups of its own name
+        self.egg_groups = {}
+        for species_name in species_egg_groups:
+            node = self.get_earliest_evolution(species_name)
+            self.egg_groups.setdefault(node, species_egg_groups.get(node, []))
+        self.egg_group_members = {}
+        for node, groups in self.egg_groups.items():
+            for group in groups:
+                self.egg_group_members.setdefault(group, []).append(node)
+        self.breedable = {
+            node
+            for node, groups in self.egg_groups.items()
+            if groups and CANNOT_BREED_EGG_GROUP not in groups
+        }
+
+        # Species that need chains for each move, by the Pokémon that have it as an egg move
+        self.move_targets = {}
+        for pokemon, moves in self.egg_moves.items():
+            for move in moves:
+                self.move_targets.setdefault(move, set()).add(
+                    self.get_earliest_evolution(pokemon)
+                )
+        self.egg_moves = {
+            node: self.egg_moves.get(node, set()) for node in self.egg_groups
+        }
+        self.natural_moves = {
+            node: self.natural_moves.get(node, set()) for node in self.egg_groups
+        }
+
+        self.partners = {}
+        self.move_chains = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["partners"] = {}
+        state["move_chains"] = {}
+        return state
+
+    def get_earliest_evolution(self, pokemon):
+        return self.earliest_evolutions.get(pokemon, pokemon)
+
+    def get_partners(self, node):
+        """Returns the other species sharing an egg group with a species, by egg group."""
+        if node not in self.partners:
+            partners = {}
+            for group in self.egg_groups.get(node, []):
+                partners.update(dict.fromkeys(self.egg_group_members[group]))
+            partners.pop(node, None)
+            self.partners[node] = list(partners)
+        return self.partners[node]
+
+    def get_species_name(self, pokemon):
+        """Returns the species of a Pokémon or form, or the name itself if it is unknown."""
+        if pokemon in self.egg_group_masks:
+            return pokemon
+        return self.species_names.get(pokemon, pokemon)
+
+    def can_breed_together(self, pokemon1, pokemon2):
+        """Returns whether two Pokémon share an egg group. Unknown names share none."""
+        masks = self.egg_group_masks
+        return bool(
+            masks.get(self.get_species_name(pokemon1), 0)
+            & masks.get(self.get_species_name(pokemon2), 0)
+        )
+
+    def breeding_partners(self, pokemon):
+        """Returns the species a Pokémon can breed with, in node order."""
+        node = self.get_earliest_evolution(self.get_species_name(pokemon))
+        if node not in self.breedable:
+            return []
+        mask = self.egg_group_masks[node]
+        return [
+            other
+            for other in self.egg_groups
+            if other != node
+            and other in self.breedable
+            and self.egg_group_masks[other] & mask
+        ]
+
+    def validate_chains(self, chains):
+        """Returns for each chain whether every species in it can breed with the next.
+
+        Chains share most of their pairs, so each distinct pair is only checked once.
+        """
+        pairs = {pair for chain in chains for pair in zip(chain, chain[1:])}
+        compatible_pairs = {
+            pair for pair in pairs if self.can_breed_together(*pair)
+        }
+        return [
+            all(pair in compatible_pairs for pair in zip(chain, chain[1:]))
+            for chain in chains
+        ]
+
+    def get_move_chains(self, move):
+        """Returns {species: chains} for every species that has the move as an egg move."""
+        if move in self.move_chains:
+            return self.move_chains[move]
+
+        sources = [
+            node
+            for node in self.egg_groups
+            if node in self.breedable and move in self.natural_moves.get(node, ())
+        ]
+        carriers = {
+            node
+            for node in self.breedable
+            if move in self.egg_moves.get(node, ())
+            and move not in self.natural_moves.get(node, ())
+        }
+        targets = self.move_targets.get(move, set())
+        # Paths only have to be kept where they are passed on or returned
+        kept_nodes = carriers | targets
+
+        paths = {}  # Species -> {source: shortest chain from the species to the source}
+        frontier = {source: {source: [source]} for source in sources}
+        for _ in range(MAX_CHAIN_LENGTH - 1):
+            next_frontier = {}
+            for node, node_paths in frontier.items():
+                for partner in self.get_partners(node):
+                    if partner not in kept_nodes:
+                        continue
+                    known_paths = paths.get(partner, {})
+                    for source, chain in node_paths.items():
+                        if source in known_paths or partner in chain:
+                            continue
+                        next_frontier.setdefault(partner, {}).setdefault(
+                            source, [partner] + chain
+                        )
+            for node, node_paths in next_frontier.items():
+                paths.setdefault(node, {}).update(node_paths)
+            # Only carriers can pass the move on to the next species
+            frontier = {
+                node: node_paths
+                for node, node_paths in next_frontier.items()
+                if node in carriers
+            }
+
+        self.move_chains[move] = {
+            target: list(paths[target].values()) for target in targets if target in paths
+        }
+        return self.move_chains[move]
+
+    def find_breeding_chains(self, pokemon, move):
+        """Returns the chains [pokemon, ..., source] for one egg move, shortest first."""
+        earliest_pokemon = self.get_earliest_evolution(pokemon)
+        return [
+            list(chain)
+            for chain in self.get_move_chains(move).get(earliest_pokemon, [])
+        ]
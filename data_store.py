@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import threading
+
+JSON_HASH_PREFIX = "json:"
+
+
+def hash_json(data):
+    """Returns a hash of parsed JSON data, e.g. to tell if a file has changed.
+
+    Compact JSON is used because json.dumps is a lot slower with indent, so this
+    differs from the hash of the saved file.
+    """
+    digest = hashlib.sha256(json.dumps(data).encode("utf-8"))
+    return JSON_HASH_PREFIX + digest.hexdigest()
+
+
+class DataStore:
+    """Keeps JSON data files in memory so several stages can work on one copy.
+
+    Files are parsed the first time they are loaded and written back by flush(),
+    which only saves the files a stage marked as changed with save(). Paths are
+    resolved first, so "./data/pokemon-data.json" and an absolute path to the same
+    file share one entry.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.dirty = set()
+        self.versions = {}  # Changes on every save, so a hash taken meanwhile is dropped
+        self.hashes = {}  # hash_json() of changed files, kept until they change again
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(path):
+        return os.path.realpath(path)
+
+    def load(self, path):
+        """Returns the data of a JSON file, reading it only if it is not loaded yet."""
+        key = self.get_key(path)
+        with self.lock:
+            if key not in self.files:
+                with open(key, "r", encoding="utf-8") as file:
+                    self.files[key] = json.load(file)
+            return self.files[key]
+
+    def save(self, path, data):
+        """Replaces the data of a file and marks it to be written by flush()."""
+        key = self.get_key(path)
+        with self.lock:
+            self.files[key] = data
+            self.dirty.add(key)
+            self.versions[key] = self.versions.get(key, 0) + 1
+            self.hashes.pop(key, None)
+
+    def get_hash(self, path):
+        """Returns the hash_json() of a file changed in memory, None if it is unchanged."""
+        key = self.get_key(path)
+        with self.lock:
+            if key not in self.dirty:
+                return None
+            if key in self.hashes:
+                return self.hashes[key]
+            data = self.files[key]
+            version = self.versions.get(key, 0)
+        file_hash = hash_json(data)
+        with self.lock:
+            if self.versions.get(key, 0) == version:
+                self.hashes[key] = file_hash
+        return file_hash
+
+    def flush(self, paths=None):
+        """Writes the changed files, or only the changed files among the given paths."""
+        with self.lock:
+            if paths is None:
+                keys = set(self.dirty)
+            else:
+                keys = {self.get_key(path) for path in paths} & self.dirty
+            for key in sorted(keys):
+                os.makedirs(os.path.dirname(key), exist_ok=True)
+                with open(key, "w", encoding="utf-8") as file:
+                    json.dump(self.files[key], file, ensure_ascii=False, indent=4)
+                self.dirty.discard(key)
+
+    def invalidate(self, paths):
+        """Forgets loaded files, e.g. after another process has written them."""
+        with self.lock:
+            for path in paths:
+                key = self.get_key(path)
+                self.files.pop(key, None)
+                self.dirty.discard(key)
+                self.hashes.pop(key, None)
@@ -1,7 +1,9 @@
-import requests
 import json
-import time
-from requests.exceptions import SSLError
+from pokeapi_client import (
+    get_generation_resource_names,
+    print_request_stats,
+    request_with_retry,
+)
 
 # Constants
 BASE_URL = "https://pokeapi.co/api/v2/ability/"
@@ -18,23 +20,6 @@ INCLUDED_ABILITIES = [
 EXCLUDED_ABILITIES = []  # List of abilities to exclude
 
 
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
-
-
 def get_all_abilities():
     abilities = []
     next_url = BASE_URL  # Start with the initial URL
@@ -122,11 +107,18 @@ def save_abilities_to_file(abilities, filename):
 
 def main():
     all_ability_names = get_all_abilities()
+    generation_abilities = get_generation_resource_names("abilities")
     all_abilities = {}
 
     for ability_name in all_ability_names:
         if ability_name in EXCLUDED_ABILITIES:
             continue  # Skip excluded abilities
+        if (
+            generation_abilities is not None
+            and ability_name not in generation_abilities
+            and ability_name not in INCLUDED_ABILITIES
+        ):
+            continue  # Skip abilities from later generations without fetching them
 
         ability_data = get_ability_data(ability_name)
         if ability_data and (
@@ -138,6 +130,7 @@ def main():
                 all_abilities[processed_data["name"]] = processed_data
 
     save_abilities_to_file(all_abilities, OUTPUT_FILE)
+    print_request_stats()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,15 @@
-import requests
 import json
-import time
-from requests.exceptions import SSLError
+from pokeapi_client import (
+    get_generation_resource_names,
+    print_request_stats,
+    request_with_retry,
+)
 
 # Base URLs for the PokeAPI
 EGG_GROUP_BASE_URL = "https://pokeapi.co/api/v2/egg-group/"
-POKEMON_SPECIES_BASE_URL = "https://pokeapi.co/api/v2/pokemon-species/"
 DATA_SAVE_PATH = "./data/"
 ALL_EGG_GROUPS_FILE = "egg-groups-data.json"
+LAST_GENERATION_5_SPECIES_ID = 649  # Genesect, used if the generations can't be fetched
 
 # Lookup table to map API egg group names to PokéMMO egg group names
 EGG_GROUP_NAME_LOOKUP = {
@@ -37,42 +39,24 @@ species_egg_group_updates = {
 }
 
 
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
-
-
 def save_data(data, file_name):
     with open(DATA_SAVE_PATH + file_name, "w", encoding="utf-8") as file:
         json.dump(data, file, ensure_ascii=False, indent=4)
 
 
-def is_in_first_five_generations(species_id):
-    response = request_with_retry(POKEMON_SPECIES_BASE_URL + str(species_id))
-    if response.status_code == 200:
-        species_data = response.json()
-        generation_number = int(species_data["generation"]["url"].split("/")[-2])
-        return generation_number <= 5
-    return False
+def get_first_five_generations_species_ids():
+    """Returns the IDs of every Pokémon species from generations 1-5."""
+    species = get_generation_resource_names("pokemon_species")
+    if species is None:
+        return set(range(1, LAST_GENERATION_5_SPECIES_ID + 1))
+    return set(species.values())
 
 
-def process_pokemon_species(pokemon_species_list):
+def process_pokemon_species(pokemon_species_list, species_ids):
     filtered_species = []
     for species in pokemon_species_list:
         species_id = species["url"].split("/")[-2]
-        if is_in_first_five_generations(species_id):
+        if int(species_id) in species_ids:
             species_data = {"name": species["name"], "id": int(species_id)}
             filtered_species.append(species_data)
     return filtered_species
@@ -116,6 +100,7 @@ def get_egg_group_data():
         return
 
     total_egg_groups = response.json()["count"]
+    species_ids = get_first_five_generations_species_ids()
 
     # Loop through all egg groups
     for i in range(1, total_egg_groups + 1):
@@ -139,7 +124,7 @@ def get_egg_group_data():
             # Process and filter pokemon_species for generations 1-5
             if "pokemon_species" in egg_group_data:
                 processed_egg_group_data["pokemon_species"] = process_pokemon_species(
-                    egg_group_data["pokemon_species"]
+                    egg_group_data["pokemon_species"], species_ids
                 )
 
             # Process name translations
@@ -159,6 +144,7 @@ def main():
     update_species_egg_groups(all_egg_groups_data, species_egg_group_updates)
 
     save_data(all_egg_groups_data, ALL_EGG_GROUPS_FILE)
+    print_request_stats()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
-import requests
 import json
+from pokeapi_client import print_request_stats, request_with_retry
 
 # Constants
 BASE_URL = "https://pokeapi.co/api/v2/item/"
@@ -13,7 +13,7 @@ def get_all_items():
     next_url = BASE_URL  # Start with the initial URL
 
     while next_url:
-        response = requests.get(next_url)
+        response = request_with_retry(next_url)
         if response.status_code == 200:
             data = response.json()
             items.extend(data.get("results", []))
@@ -25,7 +25,7 @@ def get_all_items():
     return [item["name"] for item in items]
 
 def get_item_data(item_name):
-    response = requests.get(f"{BASE_URL}{item_name}")
+    response = request_with_retry(f"{BASE_URL}{item_name}")
     if response.status_code == 200:
         return response.json()
     else:
@@ -70,6 +70,7 @@ def main():
             all_items[processed_data["name"]] = processed_data
 
     save_items_to_file(all_items, OUTPUT_FILE)
+    print_request_stats()
 
 if __name__ == "__main__":
     main()
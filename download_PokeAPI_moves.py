@@ -1,46 +1,22 @@
-import requests
 import json
-import os
-import time
-from requests.exceptions import SSLError
+from dump_ingest import load_skills_by_id
+from pokeapi_client import (
+    get_generation_resource_names,
+    print_request_stats,
+    request_with_retry,
+)
 
 # Constants
 BASE_URL = "https://pokeapi.co/api/v2/move/"
 DATA_SAVE_PATH = "./data/"
 OUTPUT_FILE = "moves-data.json"
-current_dir = os.path.dirname(os.path.abspath(__file__))
-info_directory = os.path.join(current_dir, "dump/info")
-skills_file = os.path.join(info_directory, "skills.json")
 
-
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
-
-
-def load_skills():
-    with open(skills_file, "r", encoding="utf-8") as file:
-        return json.load(file)
-
-
-def get_skill_data_by_id(move_id, skills):
-    # Assuming each skill in skills.json is a dictionary with an "id" key
-    for skill in skills:
-        if skill["id"] == move_id:
-            return skill
-    return None
+# Move fields taken from the client skills instead of PokeAPI
+SKILL_OVERRIDES = {
+    "accuracy": "base_accuracy",
+    "pp": "base_pp",
+    "power": "base_power",
+}
 
 
 def get_all_moves():
@@ -104,22 +80,19 @@ def process_effect_translations(effect_entries, flavor_text_entries):
     return translations
 
 
-def process_move_data(raw_data, skills):
+def process_move_data(raw_data):
     # Skip moves with type 'shadow'
     if raw_data.get("type", {}).get("name") == "shadow":
         return None
 
-    skill_data = get_skill_data_by_id(raw_data.get("id"), skills)
     processed_data = {
         "id": raw_data.get("id"),
         "name": raw_data.get("name"),
-        "accuracy": (
-            skill_data["base_accuracy"] if skill_data else raw_data.get("accuracy")
-        ),
+        "accuracy": raw_data.get("accuracy"),
         "effect_chance": raw_data.get("effect_chance"),
-        "pp": skill_data["base_pp"] if skill_data else raw_data.get("pp"),
+        "pp": raw_data.get("pp"),
         "priority": raw_data.get("priority"),
-        "power": skill_data["base_power"] if skill_data else raw_data.get("power"),
+        "power": raw_data.get("power"),
         "damage_class": raw_data.get("damage_class", {}).get("name"),
         "type": raw_data.get("type", {}).get("name"),
         "effect": (
@@ -135,24 +108,38 @@ def process_move_data(raw_data, skills):
     return processed_data
 
 
+def apply_skill_overrides(moves, skills_by_id):
+    """Overrides the PokeAPI values of every move that is also a client skill."""
+    for move in moves.values():
+        skill_data = skills_by_id.get(move["id"])
+        if skill_data:
+            for field, skill_field in SKILL_OVERRIDES.items():
+                move[field] = skill_data[skill_field]
+
+
 def save_moves_to_file(moves, filename):
     with open(DATA_SAVE_PATH + filename, "w", encoding="utf-8") as file:
         json.dump(moves, file, ensure_ascii=False, indent=4)
 
 
 def main():
-    skills = load_skills()  # Load the skills from the file
     all_move_names = get_all_moves()
+    generation_moves = get_generation_resource_names("moves")
     all_moves = {}
 
     for move_name in all_move_names:
+        if generation_moves is not None and move_name not in generation_moves:
+            continue  # Skip moves from later generations without fetching them
+
         move_data = get_move_data(move_name)
         if move_data and is_move_in_generations_1_to_5(move_data):
-            processed_data = process_move_data(move_data, skills)
+            processed_data = process_move_data(move_data)
             if processed_data:  # Add only if processed_data is not None
                 all_moves[processed_data["name"]] = processed_data
 
+    apply_skill_overrides(all_moves, load_skills_by_id())
     save_moves_to_file(all_moves, OUTPUT_FILE)
+    print_request_stats()
 
 
 if __name__ == "__main__":
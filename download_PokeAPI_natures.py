@@ -1,8 +1,6 @@
-import requests
 import json
 import os
-import time
-from requests.exceptions import SSLError
+from pokeapi_client import print_request_stats, request_with_retry
 
 # Constants
 BASE_URL = "https://pokeapi.co/api/v2/nature/"
@@ -15,23 +13,6 @@ if not os.path.exists(DATA_SAVE_PATH):
     os.makedirs(DATA_SAVE_PATH)
 
 
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
-
-
 def get_all_natures():
     natures = []
     next_url = BASE_URL  # Start with the initial URL
@@ -126,6 +107,7 @@ def main():
             all_natures[processed_data["name"]] = processed_data
 
     save_natures_to_file(all_natures, OUTPUT_FILE)
+    print_request_stats()
 
 
 if __name__ == "__main__":
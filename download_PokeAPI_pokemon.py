@@ -1,8 +1,8 @@
-import requests
+import argparse
 import json
 import os
-import time
-from requests.exceptions import SSLError
+from download_PokeAPI_sprites import SpriteCollector, save_sprites_data
+from pokeapi_client import prefetch, print_request_stats, request_with_retry
 
 # Base URLs for the PokeAPI
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,7 +15,11 @@ LOCATIONS_FILE = os.path.join(current_dir, "locations.json")
 SHINYTIERS_FILE = os.path.join(current_dir, "shiny-tiers.json")
 MOVES_FILE = os.path.join(current_dir, "pokemon_moves.json")  # Path to the moves file
 OBTAINABLE_FILE = os.path.join(current_dir, "obtainable_pokemon.json")
+PREFETCH_BATCH_SIZE = 50  # Number of species whose documents are downloaded together
 egg_moves_database = {}
+species_memo = {}  # Species ID -> generation ID and varieties, filled once per run
+pending_species_documents = {}  # Species fetched for a lookup before main() reached them
+pending_documents = {}  # URL -> parsed document prefetched before main() reached it
 
 # Lookup table to map API egg group names to PokéMMO egg group names
 EGG_GROUP_NAME_LOOKUP = {
@@ -354,27 +358,19 @@ egg_group_updates = {
 }
 
 
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
+def get_document(url):
+    """Returns the parsed document of a URL, or None if it could not be fetched."""
+    if url in pending_documents:
+        return pending_documents.pop(url)
+    response = request_with_retry(url)
+    if response.status_code != 200:
+        return None
+    return response.json()
 
 
 def get_evolution_chain_data(evolution_chain_url):
-    response = request_with_retry(evolution_chain_url)
-    if response.status_code == 200:
-        evolution_chain_data = response.json()
+    evolution_chain_data = get_document(evolution_chain_url)
+    if evolution_chain_data is not None:
         process_evolution_chain(evolution_chain_data["chain"])
         remove_urls(evolution_chain_data)
         del evolution_chain_data["chain"]["evolution_details"]
@@ -382,13 +378,48 @@ def get_evolution_chain_data(evolution_chain_url):
     return None
 
 
-def get_pokemon_generation(species_id):
+def get_species_data(species_id):
+    """Returns the species document and records its generation and varieties in the memo table."""
+    if species_id in pending_species_documents:
+        return pending_species_documents.pop(species_id)
+
     response = request_with_retry(POKEMON_SPECIES_URL + str(species_id))
-    if response.status_code == 200:
-        species_data = response.json()
-        generation_url = species_data["generation"]["url"]
-        generation_id = int(generation_url.split("/")[-2])
-        return generation_id
+    species_data = response.json() if response.status_code == 200 else None
+    remember_species(species_id, species_data)
+    return species_data
+
+
+def remember_species(species_id, species_data):
+    """Records the generation and varieties of a species document in the memo table."""
+    if species_data is None:
+        species_memo[species_id] = None
+        return
+    species_memo[species_id] = {
+        "generation_id": int(species_data["generation"]["url"].split("/")[-2]),
+        "varieties": [
+            {
+                "name": variety["pokemon"]["name"],
+                "id": int(variety["pokemon"]["url"].split("/")[-2]),
+                "is_default": variety["is_default"],
+            }
+            for variety in species_data["varieties"]
+        ],
+    }
+
+
+def get_species_memo(species_id):
+    """Returns the memoized species facts, fetching the species on first use."""
+    if species_id not in species_memo:
+        species_data = get_species_data(species_id)
+        if species_data is not None:
+            pending_species_documents[species_id] = species_data
+    return species_memo[species_id]
+
+
+def get_pokemon_generation(species_id):
+    species_info = get_species_memo(species_id)
+    if species_info is not None:
+        return species_info["generation_id"]
     return None
 
 
@@ -594,29 +625,24 @@ EXCLUDED_VARIATION_PATTERNS = [
 ]
 
 def process_varieties(species_id):
-    response = request_with_retry(POKEMON_SPECIES_URL + str(species_id))
-    if response.status_code == 200:
-        species_data = response.json()
-        varieties = species_data["varieties"]
-
+    species_info = get_species_memo(species_id)
+    if species_info is not None:
         processed_varieties = []
-        for variety in varieties:
-            name = variety["pokemon"]["name"]
+        for variety in species_info["varieties"]:
+            name = variety["name"]
             if any(pattern in name for pattern in EXCLUDED_VARIATION_PATTERNS):
                 continue
 
-            variety_id = int(variety["pokemon"]["url"].split("/")[-2])
-            processed_varieties.append(
-                {"name": name, "id": variety_id, "is_default": variety["is_default"]}
-            )
+            processed_varieties.append(dict(variety))
 
         return processed_varieties
 
     return []
 
 
-def process_forms(form_data):
-    processed_forms = []
+def resolve_forms(form_data):
+    """Fetches the document of every kept form once and returns (form_info, form_json) pairs."""
+    resolved_forms = []
     for form in form_data:
         form_name = form["name"]
         if any(pattern in form_name for pattern in EXCLUDED_VARIATION_PATTERNS):
@@ -624,8 +650,66 @@ def process_forms(form_data):
         form_response = request_with_retry(POKEMON_FORM_URL + form_name)
         if form_response.status_code == 200:
             form_json = form_response.json()
-            processed_forms.append({"name": form_name, "id": form_json["id"]})
-    return processed_forms
+            form_info = {"name": form_name, "id": form_json["id"]}
+            resolved_forms.append((form_info, form_json))
+    return resolved_forms
+
+
+def process_forms(resolved_forms):
+    return [form_info for form_info, _ in resolved_forms]
+
+
+def prefetch_species_tree(species_ids):
+    """Downloads the species, evolution chain, variety and form documents of a batch of species.
+
+    Each kind of document is downloaded in parallel, one kind after the other, and
+    this returns once the whole batch is in. The species, evolution chain and
+    variety documents are kept parsed for main(), which reads them from
+    pending_species_documents and pending_documents. Species already fetched
+    through an evolution chain are not downloaded again.
+    """
+    species_urls = {
+        POKEMON_SPECIES_URL + str(species_id): species_id
+        for species_id in species_ids
+        if species_id not in species_memo
+    }
+    for url, response in prefetch(species_urls, keep=False).items():
+        species_data = response.json() if response.status_code == 200 else None
+        remember_species(species_urls[url], species_data)
+        pending_species_documents[species_urls[url]] = species_data
+
+    species_dependency_urls = []
+    for species_id in species_ids:
+        species_data = pending_species_documents.get(species_id)
+        if species_data is None:
+            continue
+        if not is_in_first_five_generations(species_data["generation"]["url"]):
+            continue
+        evolution_chain_url = species_data.get("evolution_chain", {}).get("url")
+        if evolution_chain_url:
+            species_dependency_urls.append(evolution_chain_url)
+        for variety in species_data["varieties"]:
+            name = variety["pokemon"]["name"]
+            if any(pattern in name for pattern in EXCLUDED_VARIATION_PATTERNS):
+                continue
+            variety_id = int(variety["pokemon"]["url"].split("/")[-2])
+            species_dependency_urls.append(POKEMON_BASE_URL + str(variety_id))
+    dependency_responses = prefetch(
+        [url for url in species_dependency_urls if url not in pending_documents],
+        keep=False,
+    )
+
+    form_urls = []
+    for url, response in dependency_responses.items():
+        document = response.json() if response.status_code == 200 else None
+        pending_documents[url] = document
+        if not url.startswith(POKEMON_BASE_URL) or document is None:
+            continue
+        for form in document.get("forms", []):
+            if any(pattern in form["name"] for pattern in EXCLUDED_VARIATION_PATTERNS):
+                continue
+            form_urls.append(POKEMON_FORM_URL + form["name"])
+    prefetch(form_urls)
 
 
 def process_abilities(abilities):
@@ -684,20 +768,34 @@ def get_all_unique_moves(moves_data):
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Generates pokemon-data.json and pokemon-sprites.json."
+    )
+    parser.add_argument(
+        "--compact-sprites",
+        action="store_true",
+        help="Save sprite URLs relative to a base_url given once in pokemon-sprites.json.",
+    )
+    args = parser.parse_args()
+
     all_pokemon_data = {}
     locations_data = read_locations()
     shiny_tiers_data = read_shiny_tiers()
     moves_data = read_moves()
     obtainable_pokemon = read_obtainable_pokemon()
+    sprite_collector = SpriteCollector()  # Writes pokemon-sprites.json from the same documents
 
     response = request_with_retry(POKEMON_BASE_URL)
     total_count = response.json()["count"]
 
     for i in range(1, total_count + 1):
-        species_response = request_with_retry(POKEMON_SPECIES_URL + str(i))
-        if species_response.status_code == 200:
-            species_data = species_response.json()
+        if (i - 1) % PREFETCH_BATCH_SIZE == 0:
+            prefetch_species_tree(
+                range(i, min(i + PREFETCH_BATCH_SIZE, total_count + 1))
+            )
 
+        species_data = get_species_data(i)
+        if species_data is not None:
             if not is_in_first_five_generations(species_data["generation"]["url"]):
                 continue
 
@@ -737,12 +835,10 @@ def main():
             for variety in varieties:
                 variety_id = variety["id"]
                 variety_name = variety["name"]
-                pokemon_response = request_with_retry(
-                    POKEMON_BASE_URL + str(variety_id)
-                )
-                if pokemon_response.status_code == 200:
-                    pokemon_data = pokemon_response.json()
+                pokemon_data = get_document(POKEMON_BASE_URL + str(variety_id))
+                if pokemon_data is not None:
                     pokemon_name = pokemon_data["name"]
+                    sprite_collector.add_pokemon_document(variety_id, pokemon_data)
 
                     if "held_items" in pokemon_data:
                         pokemon_data["held_items"] = process_held_items(
@@ -762,8 +858,11 @@ def main():
                         pokemon_data["abilities"] = process_abilities(
                             pokemon_data["abilities"]
                         )
+                    resolved_forms = resolve_forms(pokemon_data.get("forms", []))
+                    for form_info, form_json in resolved_forms:
+                        sprite_collector.add_form_document(form_info["name"], form_json)
                     if "forms" in pokemon_data:
-                        pokemon_data["forms"] = process_forms(pokemon_data["forms"])
+                        pokemon_data["forms"] = process_forms(resolved_forms)
 
                     process_past_types(pokemon_data)
 
@@ -804,41 +903,40 @@ def main():
                     all_pokemon_data[variety_name] = merged_data
 
                     # Now process forms for the variety
-                    forms_info = process_forms(merged_data.get("forms", []))
-                    for form_info in forms_info:
+                    forms_info = merged_data.get("forms", [])
+                    for form_info, form_data in resolved_forms:
                         form_name = form_info["name"]
                         if form_name not in all_pokemon_data:
-                            form_response = request_with_retry(POKEMON_FORM_URL + str(form_info["id"]))
-                            if form_response.status_code == 200:
-                                form_data = form_response.json()
-                                form_data.pop("moves", None)
-                                if "types" in form_data:
-                                    form_data["types"] = process_types(form_data["types"])
-                                remove_urls(form_data)
-                                merged_form_data = {**species_data, **form_data}
-                                merged_form_data.pop("sprites", None)
-                                merged_form_data.pop("types", None)
-                                merged_form_data.pop("species", None)
-                                merged_form_data.pop("form_order", None)
-                                merged_form_data.pop("form_names", None)
-                                merged_form_data.pop("form_name", None)
-                                merged_form_data.pop("names", None)
-                                merged_form_data.pop("pokemon", None)
-                                merged_form_data.pop("version_group", None)
-                                merged_form_data.pop("is_battle_only", None)
-                                merged_form_data.pop("is_default", None)
-                                merged_form_data.pop("is_mega", None)
-                                merged_form_data["varieties"] = varieties
-                                merged_form_data["abilities"] = pokemon_data.get("abilities", [])
-                                merged_form_data["base_experience"] = pokemon_data.get("base_experience", [])
-                                merged_form_data["cries"] = pokemon_data.get("cries", [])
-                                merged_form_data["forms"] = forms_info
-                                merged_form_data["held_items"] = pokemon_data.get("held_items", [])
-                                merged_form_data["is_default"] = form_data.get("is_default", [])
-                                merged_form_data["sprites"] = pokemon_data.get("sprites", [])
-                                merged_form_data["stats"] = pokemon_data.get("stats", [])
-                                merged_form_data["types"] = form_data.get("types", [])
-                                all_pokemon_data[form_name] = merged_form_data
+                            form_data.pop("moves", None)
+                            if "types" in form_data:
+                                form_data["types"] = process_types(form_data["types"])
+                            remove_urls(form_data)
+                            merged_form_data = {**species_data, **form_data}
+                            merged_form_data.pop("sprites", None)
+                            merged_form_data.pop("types", None)
+                            merged_form_data.pop("species", None)
+                            merged_form_data.pop("form_order", None)
+                            merged_form_data.pop("form_names", None)
+                            merged_form_data.pop("form_name", None)
+                            merged_form_data.pop("names", None)
+                            merged_form_data.pop("pokemon", None)
+                            merged_form_data.pop("version_group", None)
+                            merged_form_data.pop("is_battle_only", None)
+                            merged_form_data.pop("is_default", None)
+                            merged_form_data.pop("is_mega", None)
+                            merged_form_data["varieties"] = varieties
+                            merged_form_data["abilities"] = pokemon_data.get("abilities", [])
+                            merged_form_data["base_experience"] = pokemon_data.get("base_experience", [])
+                            merged_form_data["cries"] = pokemon_data.get("cries", [])
+                            merged_form_data["forms"] = forms_info
+                            merged_form_data["held_items"] = pokemon_data.get("held_items", [])
+                            merged_form_data["is_default"] = form_data.get("is_default", [])
+                            merged_form_data["sprites"] = pokemon_data.get("sprites", [])
+                            merged_form_data["stats"] = pokemon_data.get("stats", [])
+                            merged_form_data["types"] = form_data.get("types", [])
+                            all_pokemon_data[form_name] = merged_form_data
+
+            sprite_collector.add_species(species_memo[i]["varieties"])
 
     all_unique_moves = get_all_unique_moves(all_pokemon_data)
 
@@ -876,6 +974,8 @@ def main():
     update_egg_groups(all_pokemon_data, egg_group_updates)
 
     save_all_data(all_pokemon_data)
+    save_sprites_data(sprite_collector.sprites_data, args.compact_sprites)
+    print_request_stats()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
-import requests
+import argparse
+import copy
 import json
 import os
-import time
-from requests.exceptions import SSLError
+from pokeapi_client import print_request_stats, request_with_retry
+
+# Builds pokemon-sprites.json. The build collects the sprites while
+# download_PokeAPI_pokemon.py crawls the Pokémon, so this script is only needed to
+# generate the file on its own.
 
 # Base URLs for the PokeAPI
 POKEMON_BASE_URL = "https://pokeapi.co/api/v2/pokemon/"
@@ -10,7 +14,90 @@ POKEMON_SPECIES_URL = "https://pokeapi.co/api/v2/pokemon-species/"
 POKEMON_FORM_URL = "https://pokeapi.co/api/v2/pokemon-form/"
 DATA_SAVE_PATH = "./data/"
 SPRITES_FILE = "pokemon-sprites.json"
+SPRITES_BASE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/"
+
+# Directory of each sprite under a version directory
+SPRITE_KEY_DIRECTORIES = {
+    "back_default": "back/",
+    "back_female": "back/female/",
+    "back_shiny": "back/shiny/",
+    "back_shiny_female": "back/shiny/female/",
+    "front_default": "",
+    "front_female": "female/",
+    "front_shiny": "shiny/",
+    "front_shiny_female": "shiny/female/",
+}
+ALL_SPRITE_KEYS = list(SPRITE_KEY_DIRECTORIES)
+FRONT_SPRITE_KEYS = ["front_default", "front_female", "front_shiny", "front_shiny_female"]
+ICON_SPRITE_KEYS = ["front_default", "front_female"]
+
+# Sprites made for forms, which PokeAPI has no version sprites for:
+# (keys in "versions", directory under SPRITES_BASE_URL, file extension, sprites)
+FORM_SPRITE_TEMPLATES = [
+    (
+        ["generation-v", "black-white", "animated"],
+        "versions/generation-v/black-white/animated/",
+        "gif",
+        ALL_SPRITE_KEYS,
+    ),
+    (
+        ["generation-v", "black-white"],
+        "versions/generation-v/black-white/",
+        "png",
+        ALL_SPRITE_KEYS,
+    ),
+    (
+        ["generation-vii", "icons"],
+        "versions/generation-vii/icons/",
+        "png",
+        ICON_SPRITE_KEYS,
+    ),
+    (
+        ["generation-vii", "ultra-sun-ultra-moon"],
+        "versions/generation-vii/ultra-sun-ultra-moon/",
+        "png",
+        FRONT_SPRITE_KEYS,
+    ),
+    (
+        ["generation-viii", "icons"],
+        "versions/generation-viii/icons/",
+        "png",
+        ICON_SPRITE_KEYS,
+    ),
+]
+
+# Varieties left out of the sprites
+EXCLUDED_VARIETY_PATTERNS = [
+    "-mega",
+    "-gmax",
+    "-alola",
+    "-hisui",
+    "-galar",
+    "-rock-star",
+    "-belle",
+    "-pop-star",
+    "-phd",
+    "-libre",
+    "-cosplay",
+    "-original-cap",
+    "-hoenn-cap",
+    "-sinnoh-cap",
+    "-unova-cap",
+    "-kalos-cap",
+    "-partner-cap",
+    "-starter",
+    "-world-cap",
+    "-primal",
+    "-paldea",
+    "-totem",
+    "palkia-origin",
+    "dialga-origin",
+    "basculin-white-striped",
+    "mothim-sandy",
+    "mothim-trash"
+]
 
+# Forms left out of the sprites
 EXCLUDED_VARIATION_PATTERNS = [
     "-mega",
     "-gmax",
@@ -52,125 +139,144 @@ EXCLUDED_VARIATION_PATTERNS = [
 ]
 
 
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
-
-
-def is_in_first_five_generations(species_url):
-    response = request_with_retry(species_url)
-    if response.status_code == 200:
-        species_data = response.json()
-        generation_url = species_data["generation"]["url"]
-        generation_id = int(generation_url.split("/")[-2])
-        return 1 <= generation_id <= 5
-    return False
-
-
-def process_varieties(species_id):
-    response = request_with_retry(POKEMON_SPECIES_URL + str(species_id))
-    if response.status_code == 200:
-        species_data = response.json()
-        varieties = species_data["varieties"]
-
-        processed_varieties = []
-        for variety in varieties:
-            name = variety["pokemon"]["name"]
-            # Exclude specific variations
-            if any(
-                excluded in name
-                for excluded in [
-                    "-mega",
-                    "-gmax",
-                    "-alola",
-                    "-hisui",
-                    "-galar",
-                    "-rock-star",
-                    "-belle",
-                    "-pop-star",
-                    "-phd",
-                    "-libre",
-                    "-cosplay",
-                    "-original-cap",
-                    "-hoenn-cap",
-                    "-sinnoh-cap",
-                    "-unova-cap",
-                    "-kalos-cap",
-                    "-partner-cap",
-                    "-starter",
-                    "-world-cap",
-                    "-primal",
-                    "-paldea",
-                    "-totem",
-                    "palkia-origin",
-                    "dialga-origin",
-                    "basculin-white-striped",
-                    "mothim-sandy",
-                    "mothim-trash"
-                ]
-            ):
-                continue
+def is_in_first_five_generations(species_data):
+    generation_url = species_data["generation"]["url"]
+    generation_id = int(generation_url.split("/")[-2])
+    return 1 <= generation_id <= 5
+
+
+def get_species_varieties(species_data):
+    return [
+        {
+            "name": variety["pokemon"]["name"],
+            "id": int(variety["pokemon"]["url"].split("/")[-2]),
+        }
+        for variety in species_data["varieties"]
+    ]
+
+
+def process_varieties(varieties):
+    return [
+        variety["id"]
+        for variety in varieties
+        if not any(excluded in variety["name"] for excluded in EXCLUDED_VARIETY_PATTERNS)
+    ]
+
 
-            variety_id = int(variety["pokemon"]["url"].split("/")[-2])
-            processed_varieties.append(variety_id)
+def get_form_sprite_versions(sprites, filename_id):
+    """Builds the "versions" sprites of a form from FORM_SPRITE_TEMPLATES.
 
-        return processed_varieties
+    A sprite is only given when the form has the matching sprite, e.g. no
+    "front_female" URLs are made for a form without a "front_female" sprite.
+    """
+    versions = {}
+    for version_path, directory, extension, sprite_keys in FORM_SPRITE_TEMPLATES:
+        version = versions
+        for key in version_path:
+            version = version.setdefault(key, {})
+        for sprite_key in sprite_keys:
+            version[sprite_key] = (
+                f"{SPRITES_BASE_URL}{directory}{SPRITE_KEY_DIRECTORIES[sprite_key]}"
+                f"{filename_id}.{extension}"
+                if sprites.get(sprite_key)
+                else None
+            )
+    return versions
 
-    return []
 
+def compact_sprite_urls(data):
+    """Returns a copy of the sprites data with URLs made relative to SPRITES_BASE_URL."""
+    if isinstance(data, dict):
+        return {key: compact_sprite_urls(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [compact_sprite_urls(value) for value in data]
+    if isinstance(data, str) and data.startswith(SPRITES_BASE_URL):
+        return data[len(SPRITES_BASE_URL):]
+    return data
 
-def process_forms(form_data):
-    processed_forms = []
-    for form in form_data:
-        form_name = form["name"]
-        if any(pattern in form_name for pattern in EXCLUDED_VARIATION_PATTERNS):
-            continue
-        form_response = request_with_retry(POKEMON_FORM_URL + form_name)
-        if form_response.status_code == 200:
-            form_json = form_response.json()
-            processed_forms.append({"name": form_name, "id": form_json["id"]})
-    return processed_forms
 
+class SpriteCollector:
+    """Builds the sprites data from Pokémon and form documents.
 
-def get_pokemon_sprites(pokemon_id):
-    response = request_with_retry(POKEMON_BASE_URL + str(pokemon_id))
-    if response.status_code == 200:
-        pokemon_data = response.json()
-        sprites = pokemon_data.get("sprites", {})
-        return {
-            "id": pokemon_id,
+    A crawl that already downloads the documents hands them over with
+    add_pokemon_document() and add_form_document() before trimming them, and then
+    calls add_species() once per species. Documents it didn't hand over are fetched.
+    """
+
+    def __init__(self):
+        self.sprites_data = {}
+        self.pokemon_documents = {}
+        self.form_documents = {}
+
+    def add_pokemon_document(self, pokemon_id, pokemon_data):
+        self.pokemon_documents[pokemon_id] = {
             "name": pokemon_data["name"],
-            "sprites": sprites,
-            "forms": pokemon_data.get("forms", []),
+            "sprites": copy.deepcopy(pokemon_data.get("sprites", {})),
+            "forms": [{"name": form["name"]} for form in pokemon_data.get("forms", [])],
         }
-    return None
-
 
-def get_pokemon_form_sprites(form_id):
-    response = request_with_retry(POKEMON_FORM_URL + str(form_id))
-    if response.status_code == 200:
-        form_data = response.json()
-        return {
+    def add_form_document(self, form_name, form_data):
+        self.form_documents[form_name] = {
             "id": form_data["id"],
             "name": form_data["name"],
-            "sprites": form_data.get("sprites", {}),
+            "sprites": copy.deepcopy(form_data.get("sprites", {})),
         }
-    return None
+
+    def get_pokemon_document(self, pokemon_id):
+        if pokemon_id not in self.pokemon_documents:
+            response = request_with_retry(POKEMON_BASE_URL + str(pokemon_id))
+            if response.status_code != 200:
+                return None
+            self.add_pokemon_document(pokemon_id, response.json())
+        return self.pokemon_documents.pop(pokemon_id)
+
+    def get_form_document(self, form_name):
+        if form_name not in self.form_documents:
+            response = request_with_retry(POKEMON_FORM_URL + form_name)
+            if response.status_code != 200:
+                return None
+            self.add_form_document(form_name, response.json())
+        return self.form_documents.pop(form_name)
+
+    def add_species(self, varieties):
+        """Adds the sprites of a species from its [{"name", "id"}] varieties."""
+        for variety_id in process_varieties(varieties):
+            pokemon_document = self.get_pokemon_document(variety_id)
+            if not pokemon_document:
+                continue
+            self.sprites_data[pokemon_document["name"]] = {
+                "id": variety_id,
+                "name": pokemon_document["name"],
+                "sprites": pokemon_document["sprites"],
+            }
+
+            for form in pokemon_document["forms"]:
+                form_name = form["name"]
+                if any(pattern in form_name for pattern in EXCLUDED_VARIATION_PATTERNS):
+                    continue
+                form_sprites = self.get_form_document(form_name)
+                if form_sprites and form_name not in self.sprites_data:
+                    filename_id = str(variety_id)
+                    if "-" in form_name:
+                        letter_part = form_name.split("-", 1)[1]
+                        filename_id = f"{filename_id}-{letter_part}"
+                    form_sprites["sprites"]["versions"] = get_form_sprite_versions(
+                        form_sprites["sprites"], filename_id
+                    )
+                    self.sprites_data[form_name] = form_sprites
+
+        # Documents of excluded varieties and forms aren't needed any more
+        self.pokemon_documents.clear()
+        self.form_documents.clear()
 
 
-def save_sprites_data(sprites_data):
+def save_sprites_data(sprites_data, compact=False):
+    """Saves the sprites data, with compact=True as a base URL and relative paths."""
+    if compact:
+        sprites_data = {
+            "base_url": SPRITES_BASE_URL,
+            "pokemon": compact_sprite_urls(sprites_data),
+        }
     with open(
         os.path.join(DATA_SAVE_PATH, SPRITES_FILE), "w", encoding="utf-8"
     ) as file:
@@ -178,76 +284,29 @@ def save_sprites_data(sprites_data):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generates pokemon-sprites.json.")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Save sprite URLs relative to a base_url given once in the file.",
+    )
+    args = parser.parse_args()
+
     os.makedirs(DATA_SAVE_PATH, exist_ok=True)
 
     response = request_with_retry(POKEMON_BASE_URL)
     total_count = response.json()["count"]
 
-    all_sprites_data = {}
+    sprite_collector = SpriteCollector()
     for i in range(1, total_count + 1):
-        species_url = POKEMON_SPECIES_URL + str(i)
-        if is_in_first_five_generations(species_url):
-            varieties = process_varieties(i)
-            for variety_id in varieties:
-                pokemon_sprites = get_pokemon_sprites(variety_id)
-                if pokemon_sprites:
-                    forms_info = process_forms(pokemon_sprites.get("forms", []))
-                    pokemon_sprites.pop("forms", None)
-                    all_sprites_data[pokemon_sprites["name"]] = pokemon_sprites
-                    
-                    for form_info in forms_info:
-                        form_sprites = get_pokemon_form_sprites(form_info["id"])
-                        if form_sprites:
-                            if form_info["name"] not in all_sprites_data:
-                                filename_id = str(pokemon_sprites["id"])
-                                if "-" in form_info["name"]:
-                                    letter_part = form_info["name"].split("-", 1)[1]
-                                    filename_id = f"{filename_id}-{letter_part}"
-                                form_sprites["sprites"]["versions"] = {
-                                    "generation-v": {
-                                        "black-white": {
-                                            "animated": {
-                                                "back_default": None if not form_sprites["sprites"].get("back_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/back/{filename_id}.gif",
-                                                "back_female": None if not form_sprites["sprites"].get("back_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/back/female/{filename_id}.gif",
-                                                "back_shiny": None if not form_sprites["sprites"].get("back_shiny") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/back/shiny/{filename_id}.gif",
-                                                "back_shiny_female": None if not form_sprites["sprites"].get("back_shiny_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/back/shiny/female/{filename_id}.gif",
-                                                "front_default": None if not form_sprites["sprites"].get("front_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/{filename_id}.gif",
-                                                "front_female": None if not form_sprites["sprites"].get("front_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/female/{filename_id}.gif",
-                                                "front_shiny": None if not form_sprites["sprites"].get("front_shiny") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/shiny/{filename_id}.gif",
-                                                "front_shiny_female": None if not form_sprites["sprites"].get("front_shiny_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/shiny/female/{filename_id}.gif",
-                                            },
-                                            "back_default": None if not form_sprites["sprites"].get("back_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/back/{filename_id}.png",
-                                            "back_female": None if not form_sprites["sprites"].get("back_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/back/female/{filename_id}.png",
-                                            "back_shiny": None if not form_sprites["sprites"].get("back_shiny") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/back/shiny/{filename_id}.png",
-                                            "back_shiny_female": None if not form_sprites["sprites"].get("back_shiny_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/back/shiny/female/{filename_id}.png",
-                                            "front_default": None if not form_sprites["sprites"].get("front_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/{filename_id}.png",
-                                            "front_female": None if not form_sprites["sprites"].get("front_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/female/{filename_id}.png",
-                                            "front_shiny": None if not form_sprites["sprites"].get("front_shiny") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/shiny/{filename_id}.png",
-                                            "front_shiny_female": None if not form_sprites["sprites"].get("front_shiny_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/shiny/female/{filename_id}.png",
-                                        }
-                                    },
-                                    "generation-vii": {
-                                        "icons": {
-                                            "front_default": None if not form_sprites["sprites"].get("front_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-vii/icons/{filename_id}.png",
-                                            "front_female": None if not form_sprites["sprites"].get("front_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-vii/icons/female/{filename_id}.png"
-                                        },
-                                        "ultra-sun-ultra-moon": {
-                                            "front_default": None if not form_sprites["sprites"].get("front_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-vii/ultra-sun-ultra-moon/{filename_id}.png",
-                                            "front_female": None if not form_sprites["sprites"].get("front_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-vii/ultra-sun-ultra-moon/female/{filename_id}.png",
-                                            "front_shiny": None if not form_sprites["sprites"].get("front_shiny") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-vii/ultra-sun-ultra-moon/shiny/{filename_id}.png",
-                                            "front_shiny_female": None if not form_sprites["sprites"].get("front_shiny_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-vii/ultra-sun-ultra-moon/shiny/female/{filename_id}.png"
-                                        }
-                                    },
-                                    "generation-viii": {
-                                        "icons": {
-                                            "front_default": None if not form_sprites["sprites"].get("front_default") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-viii/icons/{filename_id}.png",
-                                            "front_female": None if not form_sprites["sprites"].get("front_female") else f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-viii/icons/female/{filename_id}.png"
-                                        }
-                                    }
-                                }
-                                all_sprites_data[form_info["name"]] = form_sprites
-
-    save_sprites_data(all_sprites_data)
+        response = request_with_retry(POKEMON_SPECIES_URL + str(i))
+        if response.status_code == 200:
+            species_data = response.json()
+            if is_in_first_five_generations(species_data):
+                sprite_collector.add_species(get_species_varieties(species_data))
+
+    save_sprites_data(sprite_collector.sprites_data, args.compact)
+    print_request_stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+import json
+import os
+
+# Shared reading of the PokeMMO client dump in dump/.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+INFO_DIRECTORY = os.path.join(current_dir, "dump", "info")
+MONSTERS_FILE = os.path.join(INFO_DIRECTORY, "monsters.json")
+SKILLS_FILE = os.path.join(INFO_DIRECTORY, "skills.json")
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Client names that differ from the PokeAPI names used in the data files
+name_change_lookup = {
+    "nidoran♀": "nidoran-f",
+    "nidoran♂": "nidoran-m",
+    "farfetch'd": "farfetchd",
+    "mr. mime": "mr-mime",
+    "mime jr.": "mime-jr",
+    # Add more name mappings as needed
+}
+
+# Extra renames for the PvP tiers, which are given per form
+pvp_name_change_lookup = {
+    "basculin": "basculin-red-striped",
+    "wormadam": "wormadam-plant",
+}
+
+
+def get_pokemon_name(client_name):
+    """Returns the data file name of a Pokémon from its name in the dump."""
+    pokemon_name = client_name.lower()
+    return name_change_lookup.get(pokemon_name, pokemon_name)
+
+
+def load_skills_by_id(file_path=SKILLS_FILE):
+    """Returns the client skills (moves) keyed by their ID.
+
+    The first skill is kept when an ID is listed more than once.
+    """
+    skills_by_id = {}
+    for skill in iter_json_array(file_path):
+        skills_by_id.setdefault(skill["id"], skill)
+    return skills_by_id
+
+
+def iter_json_array(file_path, chunk_size=READ_CHUNK_SIZE):
+    """Yields the elements of a JSON file holding one top-level array.
+
+    The file is read in chunks and each element is decoded on its own, so only one
+    element has to be held in memory however large the file grows.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8") as file:
+        buffer = file.read(chunk_size)
+        position = 0
+
+        def next_character():
+            """Skips whitespace and returns the next character without consuming it."""
+            nonlocal buffer, position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                buffer, position = file.read(chunk_size), 0
+                if not buffer:
+                    raise ValueError(f"Unexpected end of {file_path}")
+
+        if next_character() != "[":
+            raise ValueError(f"{file_path} does not hold a JSON array")
+        position += 1
+        if next_character() == "]":
+            return
+
+        while True:
+            next_character()
+            while True:
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                    # A number at the end of the buffer may be cut short, so the
+                    # value only counts once the "," or "]" after it has been read.
+                    following = end
+                    while following < len(buffer) and buffer[following].isspace():
+                        following += 1
+                    if following < len(buffer) and buffer[following] in ",]":
+                        break
+                except json.JSONDecodeError:
+                    pass
+                more = file.read(chunk_size)
+                if not more:
+                    element, end = decoder.raw_decode(buffer, position)
+                    break
+                buffer, position = buffer[position:] + more, 0
+            yield element
+
+            position = end
+            character = next_character()
+            position += 1
+            if character == "]":
+                return
+            if character != ",":
+                raise ValueError(
+                    f"Expected ',' or ']' in {file_path}, found {character!r}"
+                )
@@ -1,68 +1,738 @@
+import argparse
+import concurrent.futures
+import hashlib
+import importlib
+import json
 import subprocess
 import os
 import shutil
+import threading
+import time
+import traceback
+
+from data_store import JSON_HASH_PREFIX, DataStore, hash_json
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 data_dir = os.path.join(parent_dir, "data")
+DEFAULT_RATE_LIMIT = 10  # Requests per second, matches pokeapi_client.py
+print_lock = threading.Lock()  # Keeps the output of scripts running at once apart
 
-# Check if the data directory exists
-if not os.path.exists(data_dir):
-    # Create the data directory if it doesn't exist
-    os.makedirs(data_dir)
-else:
-    # If the data directory exists, remove all files within it
-    for filename in os.listdir(data_dir):
-        file_path = os.path.join(data_dir, filename)
-        try:
-            if os.path.isfile(file_path) or os.path.islink(file_path):
-                os.unlink(file_path)
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-        except Exception as e:
-            print(f"Failed to delete {file_path}. Reason: {e}")
+
+def clear_data_dir():
+    """Creates the data directory, or removes all files within it if it exists."""
+    # Check if the data directory exists
+    if not os.path.exists(data_dir):
+        # Create the data directory if it doesn't exist
+        os.makedirs(data_dir)
+    else:
+        # If the data directory exists, remove all files within it
+        for filename in os.listdir(data_dir):
+            file_path = os.path.join(data_dir, filename)
+            try:
+                if os.path.isfile(file_path) or os.path.islink(file_path):
+                    os.unlink(file_path)
+                elif os.path.isdir(file_path):
+                    shutil.rmtree(file_path)
+            except Exception as e:
+                print(f"Failed to delete {file_path}. Reason: {e}")
 
 
-def run_script(script_path):
-    """Runs a Python script at the given path."""
+def run_script(script_path, env=None, args=()):
+    """Runs a Python script at the given path and returns whether it succeeded."""
     try:
         result = subprocess.run(
-            ["python", script_path], check=True, text=True, capture_output=True
+            ["python", script_path, *args],
+            check=True,
+            text=True,
+            capture_output=True,
+            cwd=parent_dir,
+            env=env,
         )
-        print(f"Script {script_path} executed successfully.")
-        print("Output:\n", result.stdout)
+        with print_lock:
+            print(f"Script {script_path} executed successfully.")
+            print("Output:\n", result.stdout)
+        return True
     except subprocess.CalledProcessError as e:
-        print(f"Error in script {script_path}: {e}")
-
-
-# List of scripts to run
-scripts_to_run = [
-    os.path.join(current_dir, "generate_obtainable_pokemon.py"),
-    os.path.join(current_dir, "generate_pokemon_moves.py"),
-    os.path.join(current_dir, "generate_locations.py"),
-    # os.path.join(current_dir, "generate_pvp_data_Input.py"), Removed cause there seems to be a regression in the exportable data.
-    os.path.join(current_dir, "download_PokeAPI_pokemon.py"),
-    os.path.join(current_dir, "download_PokeAPI_egg-group.py"),
-    os.path.join(current_dir, "download_PokeAPI_moves.py"),
-    os.path.join(current_dir, "generate_PokeMMO_items.py"),
-    os.path.join(current_dir, "generate_egg_moves.py"),
-    os.path.join(current_dir, "download_PokeAPI_abilities.py"),
-    os.path.join(current_dir, "patch_data_files.py"),
-    os.path.join(current_dir, "add_pokemon_to_moves.py"),
-    os.path.join(current_dir, "add_pokemon_to_abilities.py"),
-    os.path.join(current_dir, "add_pvp_to_pokemon.py"),
-    os.path.join(current_dir, "generate_pvp_data.py"),
-    os.path.join(current_dir, "generate_types_data.py"),
-    os.path.join(current_dir, "generate_location_data.py"),
-    os.path.join(current_dir, "generate_location_rarities.py"),
-    os.path.join(current_dir, "generate_location_regions.py"),
-    os.path.join(current_dir, "generate_location_types.py"),
-    os.path.join(current_dir, "generate_obtainable_data.py"),
-    os.path.join(current_dir, "generate_held_items.py"),
-    os.path.join(current_dir, "download_PokeAPI_natures.py"),
-    os.path.join(current_dir, "generate_gender_rates.py"),
-    os.path.join(current_dir, "download_PokeAPI_sprites.py"),
+        with print_lock:
+            print(f"Error in script {script_path}: {e}")
+            print("Output:\n", e.stdout, e.stderr)
+        return False
+
+
+def repo_file(*parts):
+    return os.path.join(current_dir, *parts)
+
+
+def data_file(filename):
+    return os.path.join(data_dir, filename)
+
+
+MONSTERS_DUMP = repo_file("dump", "info", "monsters.json")
+HELD_ITEMS = repo_file("pokemon_held_items.json")
+POKEMON_DATA = data_file("pokemon-data.json")
+MOVES_DATA = data_file("moves-data.json")
+ABILITIES_DATA = data_file("abilities-data.json")
+ITEM_DATA = data_file("item-data.json")
+LOCATION_DATA = data_file("location-data.json")
+
+# Incremental rebuild state. The manifest keeps the content hashes each stage was
+# last run with, and the outputs of that run are kept so a skipped stage can put
+# them back after the data directory has been cleared.
+BUILD_DIR = repo_file(".build")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+SNAPSHOT_DIR = os.path.join(BUILD_DIR, "outputs")
+REQUEST_LOG_DIR = os.path.join(BUILD_DIR, "requests")
+
+# Scripts to run, in the order they were written to run in. Each stage lists the
+# files it reads and writes; stages are started as soon as every earlier stage
+# that touches the same files has finished. "api" marks stages that download
+# from PokeAPI and "in_process" stages whose run(store) function can work on the
+# shared in-memory data of an --in-process build. "sources" lists the other
+# modules a script imports, so changes to them cause it to run again. "options"
+# are passed to run() as keyword arguments, or to the script as --flags.
+stages = [
+    # generate_dump_data.py --tiers is not run cause there seems to be a regression in the exportable data.
+    {
+        "script": "generate_dump_data.py",
+        "sources": ["dump_ingest.py"],
+        "inputs": [MONSTERS_DUMP, repo_file("patch_locations.json")],
+        "outputs": [
+            repo_file("obtainable_pokemon.json"),
+            repo_file("pokemon_moves.json"),
+            repo_file("locations.json"),
+            HELD_ITEMS,
+        ],
+    },
+    {
+        "script": "download_PokeAPI_pokemon.py",
+        "api": True,
+        "sources": ["download_PokeAPI_sprites.py"],
+        "inputs": [
+            repo_file("locations.json"),
+            repo_file("shiny-tiers.json"),
+            repo_file("pokemon_moves.json"),
+            repo_file("obtainable_pokemon.json"),
+        ],
+        "outputs": [POKEMON_DATA, data_file("pokemon-sprites.json")],
+    },
+    {
+        "script": "download_PokeAPI_egg-group.py",
+        "api": True,
+        "inputs": [],
+        "outputs": [data_file("egg-groups-data.json")],
+    },
+    {
+        "script": "download_PokeAPI_moves.py",
+        "api": True,
+        "sources": ["dump_ingest.py"],
+        "inputs": [repo_file("dump", "info", "skills.json")],
+        "outputs": [MOVES_DATA],
+    },
+    {
+        "script": "generate_PokeMMO_items.py",
+        "inputs": [
+            repo_file("dump", "info", "items.json"),
+            repo_file("dump", "strings"),
+        ],
+        "outputs": [ITEM_DATA],
+    },
+    {
+        "script": "generate_egg_moves.py",
+        "inputs": [repo_file("dump", "20230429_egg_moves.txt")],
+        "outputs": [data_file("egg-moves-data.json")],
+    },
+    {
+        "script": "download_PokeAPI_abilities.py",
+        "api": True,
+        "inputs": [],
+        "outputs": [ABILITIES_DATA],
+    },
+    {
+        "script": "patch_data_files.py",
+        "in_process": True,
+        "inputs": [
+            POKEMON_DATA,
+            ABILITIES_DATA,
+            MOVES_DATA,
+            repo_file("patch_pokemon-data.json"),
+            repo_file("patch_move-data.json"),
+            repo_file("patch_renames.json"),
+        ],
+        "outputs": [POKEMON_DATA, ABILITIES_DATA, MOVES_DATA],
+    },
+    {
+        "script": "add_pvp_to_pokemon.py",
+        "in_process": True,
+        "inputs": [POKEMON_DATA, repo_file("pokemon-pvp-data.json")],
+        "outputs": [POKEMON_DATA],
+    },
+    {
+        "script": "generate_reverse_indexes.py",
+        "in_process": True,
+        "api": True,
+        "sources": [
+            "add_pokemon_to_moves.py",
+            "add_pokemon_to_abilities.py",
+            "generate_types_data.py",
+            "generate_gender_rates.py",
+            "generate_pvp_data.py",
+            "generate_obtainable_data.py",
+            "reverse_index.py",
+        ],
+        "inputs": [POKEMON_DATA, MOVES_DATA, ABILITIES_DATA],
+        "outputs": [
+            MOVES_DATA,
+            ABILITIES_DATA,
+            data_file("types-data.json"),
+            data_file("gender-rates.json"),
+            data_file("pvp-data.json"),
+            data_file("obtainable-data.json"),
+        ],
+    },
+    {
+        "script": "generate_location_data.py",
+        "in_process": True,
+        "inputs": [POKEMON_DATA],
+        "outputs": [
+            LOCATION_DATA,
+            data_file("location-rarities.json"),
+            data_file("location-regions.json"),
+            data_file("location-types.json"),
+        ],
+    },
+    {
+        "script": "generate_held_items.py",
+        "in_process": True,
+        "sources": ["reverse_index.py"],
+        "inputs": [
+            POKEMON_DATA,
+            ITEM_DATA,
+            HELD_ITEMS,
+            repo_file("dump", "info", "items.json"),
+        ],
+        "outputs": [POKEMON_DATA, ITEM_DATA],
+    },
+    {
+        "script": "download_PokeAPI_natures.py",
+        "api": True,
+        "inputs": [],
+        "outputs": [data_file("natures-data.json")],
+    },
 ]
 
-for script in scripts_to_run:
-    run_script(script)
+
+def build_dependencies(stages):
+    """Returns, for each stage, the indexes of the earlier stages it has to wait for.
+
+    A stage waits for an earlier stage when it reads a file the earlier stage
+    writes, writes a file the earlier stage writes, or writes a file the earlier
+    stage reads. This keeps the results identical to running the list in order.
+    """
+    dependencies = []
+    for index, stage in enumerate(stages):
+        inputs = set(stage["inputs"])
+        outputs = set(stage["outputs"])
+        stage_dependencies = set()
+        for earlier_index in range(index):
+            earlier_stage = stages[earlier_index]
+            earlier_outputs = set(earlier_stage["outputs"])
+            if (
+                earlier_outputs & (inputs | outputs)
+                or set(earlier_stage["inputs"]) & outputs
+            ):
+                stage_dependencies.add(earlier_index)
+        dependencies.append(stage_dependencies)
+    return dependencies
+
+
+def find_critical_path(stages, dependencies, durations):
+    """Returns the chain of dependent stages with the longest total run time."""
+    finish_times = []
+    previous_stage = []
+    for index in range(len(stages)):
+        slowest_dependency = max(
+            dependencies[index], key=lambda i: finish_times[i], default=None
+        )
+        start_time = 0
+        if slowest_dependency is not None:
+            start_time = finish_times[slowest_dependency]
+        finish_times.append(start_time + durations.get(index, 0))
+        previous_stage.append(slowest_dependency)
+
+    index = max(range(len(stages)), key=lambda i: finish_times[i])
+    critical_path = []
+    while index is not None:
+        critical_path.append(index)
+        index = previous_stage[index]
+    return list(reversed(critical_path))
+
+
+def run_stages(stages, jobs, api_jobs, force=False, store=None):
+    """Runs the stages on a worker pool and returns the result of each stage.
+
+    When a DataStore is given, the "in_process" stages run in this process on the
+    data it holds.
+    """
+    dependencies = build_dependencies(stages)
+    env = dict(os.environ)
+    if api_jobs > 1:
+        # Split the request budget between the download scripts running at once.
+        rate_limit = float(env.get("POKEAPI_RATE_LIMIT", DEFAULT_RATE_LIMIT))
+        env["POKEAPI_RATE_LIMIT"] = str(rate_limit / api_jobs)
+        if store is not None:
+            # Stages run in-process share the PokeAPI client of this process.
+            from pokeapi_client import set_rate_limit
+
+            set_rate_limit(rate_limit / api_jobs)
+
+    previous_manifest = load_manifest()
+    manifest = {}
+    results = {}
+    running = {}
+    running_api_stages = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        while len(results) < len(stages):
+            for index, stage in enumerate(stages):
+                if index in results or index in running.values():
+                    continue
+                if not dependencies[index] <= results.keys():
+                    continue
+                if len(running) >= jobs:
+                    break
+                if stage.get("api") and running_api_stages >= api_jobs:
+                    continue
+                if stage.get("api"):
+                    running_api_stages += 1
+                future = executor.submit(
+                    build_stage,
+                    stage,
+                    previous_manifest.get(stage["script"]),
+                    env,
+                    force,
+                    store,
+                )
+                running[future] = index
+
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                index = running.pop(future)
+                results[index] = future.result()
+                manifest[stages[index]["script"]] = results[index]
+                save_manifest(manifest)
+                if stages[index].get("api"):
+                    running_api_stages -= 1
+
+    return dependencies, results
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+
+def hash_path(path):
+    """Returns the SHA-256 of a file or of every file in a directory, None if missing."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                file_path = os.path.join(root, filename)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+                digest.update(hash_path(file_path).encode("utf-8"))
+        return digest.hexdigest()
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_stage_sources(stage):
+    sources = [stage["script"]] + stage.get("sources", [])
+    if stage.get("api"):
+        sources.append("pokeapi_client.py")
+    if stage.get("in_process"):
+        sources.append("data_store.py")
+    return sources
+
+
+def get_stage_args(stage):
+    """Turns the options of a stage into command line flags for its script."""
+    args = []
+    for option, value in stage.get("options", {}).items():
+        flag = "--" + option.replace("_", "-")
+        if value is True:
+            args.append(flag)
+        elif value not in (False, None):
+            args.extend([flag, str(value)])
+    return args
+
+
+def get_snapshot_path(stage, output_path):
+    stage_name = os.path.splitext(stage["script"])[0]
+    return os.path.join(SNAPSHOT_DIR, stage_name, os.path.basename(output_path))
+
+
+def hash_input(path, store=None):
+    """Returns the hash of an input file, or its hash_json() if a DataStore changed it."""
+    file_hash = store.get_hash(path) if store is not None else None
+    if file_hash is None:
+        return hash_path(path)
+    return file_hash
+
+
+def is_input_unchanged(name, previous_hash, file_hash):
+    """Compares an input with its previous hash, taken with hash_json() by --in-process."""
+    if previous_hash is None or not previous_hash.startswith(JSON_HASH_PREFIX):
+        return previous_hash == file_hash
+    try:
+        with open(os.path.join(parent_dir, name), "r", encoding="utf-8") as f:
+            return hash_json(json.load(f)) == previous_hash
+    except (OSError, ValueError):
+        return False
+
+
+def get_stage_fingerprint(stage, store=None):
+    """Returns the content hashes of a stage's script and input files."""
+    return {
+        "options": stage.get("options", {}),
+        "sources": {
+            source: hash_path(repo_file(source)) for source in get_stage_sources(stage)
+        },
+        "inputs": {
+            os.path.relpath(path, parent_dir): hash_input(path, store)
+            for path in stage["inputs"]
+        },
+    }
+
+
+def save_output_snapshots(stage, overwritten_outputs=()):
+    """Keeps a copy of the outputs of a stage, except those a later stage wrote again."""
+    for output_path in stage["outputs"]:
+        snapshot_path = get_snapshot_path(stage, output_path)
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        if output_path not in overwritten_outputs and os.path.isfile(output_path):
+            shutil.copyfile(output_path, snapshot_path)
+        elif os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+
+def save_in_process_snapshots(stages, results):
+    """Keeps the outputs of the stages run in-process, once flush() has saved them.
+
+    Only the last version of each file is saved, so a stage whose output was
+    written again by a later stage gets no snapshot of it and runs again in the
+    next build.
+    """
+    for index, stage in enumerate(stages):
+        if results[index]["reason"] != "run in-process":
+            continue
+        if "fingerprint" not in results[index]:
+            continue
+        overwritten_outputs = {
+            output_path
+            for later_stage in stages[index + 1 :]
+            for output_path in later_stage["outputs"]
+        }
+        save_output_snapshots(stage, overwritten_outputs)
+
+
+def describe_changes(kind, names):
+    if len(names) == 1:
+        return f"{kind} changed: {names[0]}"
+    return f"{len(names)} {kind}s changed, e.g. {names[0]}"
+
+
+def find_rebuild_reason(stage, fingerprint, previous_entry):
+    """Returns why a stage has to run, or None if its previous outputs can be reused."""
+    if previous_entry is None or "fingerprint" not in previous_entry:
+        return "no previous successful run"
+    if stage.get("api") and os.environ.get("POKEAPI_RECORD"):
+        # Responses are only recorded by the scripts that request them.
+        return "recording PokeAPI responses"
+    previous_fingerprint = previous_entry["fingerprint"]
+
+    if previous_fingerprint.get("options", {}) != fingerprint["options"]:
+        return "options changed"
+
+    for key, kind in (("sources", "script"), ("inputs", "input")):
+        changed = [
+            name
+            for name, file_hash in fingerprint[key].items()
+            if not is_input_unchanged(name, previous_fingerprint[key].get(name), file_hash)
+        ]
+        if changed:
+            return describe_changes(kind, changed)
+
+    if stage.get("api"):
+        # Imported here so the PokeAPI settings set by main() are picked up.
+        from pokeapi_client import get_local_response_hash
+
+        changed = [
+            url
+            for url, response_hash in previous_fingerprint["api"].items()
+            if get_local_response_hash(url) != response_hash
+        ]
+        if changed:
+            return describe_changes("API response", changed)
+
+    for output_path in stage["outputs"]:
+        if not os.path.exists(get_snapshot_path(stage, output_path)):
+            return f"previous output missing: {os.path.basename(output_path)}"
+    return None
+
+
+def build_stage(stage, previous_entry, env, force, store=None):
+    """Runs a stage, or restores its previous outputs if none of its inputs changed.
+
+    Returns the manifest entry of the stage.
+    """
+    if store is None:
+        return build_script_stage(stage, previous_entry, env, force)
+    if stage.get("in_process"):
+        return run_stage_in_process(stage, store)
+
+    # The script reads its inputs from disk and may rewrite files the store holds.
+    store.flush(stage["inputs"])
+    entry = build_script_stage(stage, previous_entry, env, force)
+    store.invalidate(stage["outputs"])
+    return entry
+
+
+def run_stage_in_process(stage, store):
+    """Runs the run(store) function of a stage. Its outputs are only saved by flush().
+
+    The stage gets a fingerprint like a script run, so the next build without
+    --in-process can skip it. Inputs only changed in memory are hashed with
+    hash_json() instead of being serialized like flush() does. Its output
+    snapshots are taken by save_in_process_snapshots() after the flush.
+    """
+    start_time = time.perf_counter()
+    fingerprint = get_stage_fingerprint(stage, store)
+    save_output_snapshots(stage, stage["outputs"])  # Drop those of an earlier build
+    response_log = None
+    if stage.get("api"):
+        from pokeapi_client import log_responses
+
+        response_log = {}
+        log_responses(response_log)
+    try:
+        module = importlib.import_module(os.path.splitext(stage["script"])[0])
+        module.run(store, **stage.get("options", {}))
+        succeeded = True
+    except Exception:
+        with print_lock:
+            print(f"Error in script {stage['script']}:")
+            print(traceback.format_exc())
+        succeeded = False
+    finally:
+        if response_log is not None:
+            log_responses(None)
+
+    entry = {
+        "status": "ran" if succeeded else "failed",
+        "reason": "run in-process",
+        "duration": time.perf_counter() - start_time,
+    }
+    if not succeeded:
+        return entry
+    if response_log is not None:
+        fingerprint["api"] = response_log
+    entry["fingerprint"] = fingerprint
+    return entry
+
+
+def build_script_stage(stage, previous_entry, env, force):
+    start_time = time.perf_counter()
+    fingerprint = get_stage_fingerprint(stage)
+    reason = "forced" if force else find_rebuild_reason(stage, fingerprint, previous_entry)
+
+    if reason is None:
+        for output_path in stage["outputs"]:
+            shutil.copyfile(get_snapshot_path(stage, output_path), output_path)
+        if "api" in previous_entry["fingerprint"]:
+            fingerprint["api"] = previous_entry["fingerprint"]["api"]
+        return {
+            "status": "skipped",
+            "reason": "inputs unchanged",
+            "duration": time.perf_counter() - start_time,
+            "fingerprint": fingerprint,
+        }
+
+    stage_env = env
+    request_log_path = None
+    if stage.get("api"):
+        os.makedirs(REQUEST_LOG_DIR, exist_ok=True)
+        request_log_path = os.path.join(
+            REQUEST_LOG_DIR, os.path.splitext(stage["script"])[0] + ".json"
+        )
+        if os.path.exists(request_log_path):
+            os.remove(request_log_path)
+        stage_env = dict(env, POKEAPI_REQUEST_LOG=request_log_path)
+
+    succeeded = run_script(
+        os.path.join(current_dir, stage["script"]), stage_env, get_stage_args(stage)
+    )
+    entry = {
+        "status": "ran" if succeeded else "failed",
+        "reason": reason,
+        "duration": time.perf_counter() - start_time,
+    }
+    if not succeeded:
+        return entry
+
+    if request_log_path is not None:
+        try:
+            with open(request_log_path, "r", encoding="utf-8") as f:
+                fingerprint["api"] = json.load(f)
+        except (OSError, ValueError):
+            # Without the list of responses there is no way to tell if it is stale.
+            return entry
+    save_output_snapshots(stage)
+    entry["fingerprint"] = fingerprint
+    return entry
+
+
+def print_timings(stages, dependencies, results, total_time):
+    print("Stage timings:")
+    for index, stage in enumerate(stages):
+        result = results[index]
+        print(
+            f"  {result['duration']:8.1f}s  {result['status']:<7}  {stage['script']}"
+            f" ({result['reason']})"
+        )
+
+    durations = {index: result["duration"] for index, result in results.items()}
+    critical_path = find_critical_path(stages, dependencies, durations)
+    critical_time = sum(durations[index] for index in critical_path)
+    print(f"Critical path ({critical_time:.1f}s):")
+    for index in critical_path:
+        print(f"  {durations[index]:8.1f}s  {stages[index]['script']}")
+    print(f"Total wall-clock time: {total_time:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates all of the data files.")
+    parser.add_argument(
+        "--mirror",
+        help="Read PokeAPI from a local api-data checkout instead of the network.",
+    )
+    parser.add_argument(
+        "--record",
+        help="Save every PokeAPI response of this run to the given zip archive.",
+    )
+    parser.add_argument(
+        "--replay",
+        help="Serve PokeAPI responses only from a zip archive made with --record.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of scripts to run at the same time.",
+    )
+    parser.add_argument(
+        "--api-jobs",
+        type=int,
+        default=2,
+        help="Number of PokeAPI download scripts to run at the same time.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run every script, even those whose inputs have not changed.",
+    )
+    parser.add_argument(
+        "--shared-encounters",
+        action="store_true",
+        help=(
+            "Save each location encounter once in location-encounters.json and "
+            "refer to it by index in the other location files."
+        ),
+    )
+    parser.add_argument(
+        "--experimental-egg-moves",
+        action="store_true",
+        help=(
+            "Work out the egg move breeding chains from the Pokemon and egg group "
+            "data with generate_egg_moves_exp.py instead of reading the client dump."
+        ),
+    )
+    parser.add_argument(
+        "--compact-sprites",
+        action="store_true",
+        help=(
+            "Save sprite URLs in pokemon-sprites.json relative to a base_url "
+            "given once in the file."
+        ),
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help=(
+            "Run the scripts that process pokemon-data.json in this process on one "
+            "shared copy of the data, saving the files once at the end."
+        ),
+    )
+    args = parser.parse_args()
+
+    # The download scripts pick these settings up from the environment.
+    if args.mirror:
+        os.environ["POKEAPI_MIRROR_DIR"] = os.path.abspath(args.mirror)
+    if args.record:
+        os.environ["POKEAPI_RECORD"] = os.path.abspath(args.record)
+    if args.replay:
+        os.environ["POKEAPI_REPLAY"] = os.path.abspath(args.replay)
+
+    if args.shared_encounters:
+        for stage in stages:
+            if stage["script"] == "generate_location_data.py":
+                stage["options"] = {"shared_encounters": True}
+                stage["outputs"].append(data_file("location-encounters.json"))
+
+    if args.experimental_egg_moves:
+        for stage in stages:
+            if stage["script"] == "generate_egg_moves.py":
+                stage["script"] = "generate_egg_moves_exp.py"
+                stage["sources"] = ["breeding_graph.py"]
+                stage["inputs"] = [POKEMON_DATA, data_file("egg-groups-data.json")]
+
+    if args.compact_sprites:
+        for stage in stages:
+            if stage["script"] == "download_PokeAPI_pokemon.py":
+                stage["options"] = {"compact_sprites": True}
+
+    store = None
+    if args.in_process:
+        # The scripts use paths relative to the directory they are run from.
+        os.chdir(parent_dir)
+        store = DataStore()
+
+    start_time = time.perf_counter()
+    clear_data_dir()
+    dependencies, results = run_stages(
+        stages, max(args.jobs, 1), max(args.api_jobs, 1), args.force, store
+    )
+    if store is not None:
+        store.flush()
+        save_in_process_snapshots(stages, results)
+    print_timings(stages, dependencies, results, time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    main()
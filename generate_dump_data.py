@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import re
+
+from dump_ingest import (
+    MONSTERS_FILE,
+    get_pokemon_name,
+    iter_json_array,
+    pvp_name_change_lookup,
+)
+
+# Reads dump/info/monsters.json once and writes every file taken from it:
+# obtainable_pokemon.json, pokemon_moves.json, locations.json, the held items
+# used by generate_held_items.py and, with --tiers, pokemon-pvp-data.json.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+OBTAINABLE_FILE = os.path.join(current_dir, "obtainable_pokemon.json")
+MOVES_FILE = os.path.join(current_dir, "pokemon_moves.json")
+LOCATIONS_FILE = os.path.join(current_dir, "locations.json")
+LOCATIONS_PATCH_FILE = os.path.join(current_dir, "patch_locations.json")
+HELD_ITEMS_FILE = os.path.join(current_dir, "pokemon_held_items.json")
+PVP_DATA_FILE = os.path.join(current_dir, "pokemon-pvp-data.json")
+
+# Lookup table for tier name changes
+tier_lookup = {
+    "Untiered": "UN",
+    "Under Used": "UU",
+    "Never Used": "NU",
+    "Over Used": "OU",
+    "Ubers": "UB",
+    # Add any additional tier mappings here
+}
+
+# Custom Pokémon data to be added or override existing entries
+custom_pokemon_data = {
+    "castform-sunny": {"pvp": [{"tier": "UN"}]},
+    "castform-rainy": {"pvp": [{"tier": "UN"}]},
+    "castform-snowy": {"pvp": [{"tier": "UN"}]},
+    "deoxys-normal": {"pvp": [{"tier": "UB"}]},
+    "deoxys-attack": {"pvp": [{"tier": "UB"}]},
+    "deoxys-defense": {"pvp": [{"tier": "UB"}]},
+    "deoxys-speed": {"pvp": [{"tier": "UB"}]},
+    "wormadam-sandy": {"pvp": [{"tier": "UN"}]},
+    "wormadam-trash": {"pvp": [{"tier": "UN"}]},
+    "rotom-heat": {"pvp": [{"tier": "UU"}]},
+    "rotom-wash": {"pvp": [{"tier": "UU"}]},
+    "rotom-frost": {"pvp": [{"tier": "UU"}]},
+    "rotom-fan": {"pvp": [{"tier": "UU"}]},
+    "rotom-mow": {"pvp": [{"tier": "UU"}]},
+    "giratina-altered": {"pvp": [{"tier": "UB"}]},
+    "giratina-origin": {"pvp": [{"tier": "UB"}]},
+    "shaymin-sky": {"pvp": [{"tier": "UB"}]},
+    "shaymin-land": {"pvp": [{"tier": "OU"}]},
+    "basculin-blue-striped": {"pvp": [{"tier": "UN"}]},
+    "darmanitan-standard": {"pvp": [{"tier": "OU"}]},
+    "darmanitan-zen": {"pvp": [{"tier": "OU"}]},
+    "tornadus-incarnate": {"pvp": [{"tier": "UB"}]},
+    "tornadus-therian": {"pvp": [{"tier": "UB"}]},
+    "thundurus-incarnate": {"pvp": [{"tier": "UB"}]},
+    "thundurus-therian": {"pvp": [{"tier": "UB"}]},
+    "landorus-incarnate": {"pvp": [{"tier": "UB"}]},
+    "landorus-therian": {"pvp": [{"tier": "UB"}]},
+    "kyurem-black": {"pvp": [{"tier": "UB"}]},
+    "kyurem-white": {"pvp": [{"tier": "UB"}]},
+    "keldeo-ordinary": {"pvp": [{"tier": "UB"}]},
+    "keldeo-resolute": {"pvp": [{"tier": "UB"}]},
+    "meloetta-aria": {"pvp": [{"tier": "UB"}]},
+    "meloetta-pirouette": {"pvp": [{"tier": "UB"}]},
+    # Add more custom Pokémon data as needed
+}
+
+
+def extract_time_from_location(location_name):
+    """
+    Extracts time/season info from location name in parentheses, e.g. "Route 1 (Day/Morning)".
+    Returns (cleaned_location_name, time_string).
+    If no parentheses, returns (location_name, "ALL").
+    """
+    match = re.search(r"\(([^)]+)\)", location_name)
+    if match:
+        time = match.group(1)
+        # Remove the parenthetical from the location name
+        cleaned_location = re.sub(r"\s*\([^)]+\)", "", location_name)
+        return cleaned_location, time
+    else:
+        return location_name, "ALL"
+
+
+def process_locations(locations):
+    """
+    For each location dict, extract time info from the location name and add a 'time' field.
+    """
+    processed = []
+    for loc in locations:
+        # Defensive: skip if not a dict or missing 'location'
+        if not isinstance(loc, dict) or "location" not in loc:
+            processed.append(loc)
+            continue
+        cleaned_location, time = extract_time_from_location(loc["location"])
+        loc = dict(loc)  # shallow copy to avoid mutating input
+        loc["location"] = cleaned_location
+        loc["time"] = time
+        processed.append(loc)
+    return processed
+
+
+def apply_locations_patch(locations_data, patch_data):
+    """Applies additions and removals from the patch file to the locations data."""
+    # Add locations
+    for pokemon, new_locations in patch_data.get("add", {}).items():
+        if pokemon not in locations_data:
+            locations_data[pokemon] = {"locations": []}
+        locations_data[pokemon]["locations"].extend(new_locations)
+
+    # Remove locations
+    for pokemon, locations_to_remove in patch_data.get("remove", {}).items():
+        if pokemon in locations_data:
+            locations_data[pokemon]["locations"] = [
+                loc
+                for loc in locations_data[pokemon]["locations"]
+                if loc["location"] not in locations_to_remove
+            ]
+            # Remove the Pokémon entry if no locations remain
+            if not locations_data[pokemon]["locations"]:
+                del locations_data[pokemon]
+
+
+def get_pvp_tier(pokemon):
+    """Returns the short tier name of a Pokémon in the dump, "UN" if it has none."""
+    tier_info = pokemon.get("tiers", "UN")  # Default to "UN" if tier is not specified
+    if isinstance(tier_info, list):
+        tier = tier_info[0] if tier_info else "UN"
+    else:
+        tier = tier_info
+    return tier_lookup.get(tier, "UN")  # Map tier using the lookup table, default to "UN"
+
+
+def ingest_monsters(filepath, include_tiers=False):
+    """Builds every file taken from the monsters dump in one pass over it."""
+    obtainable_data = {}
+    moves_data = {}
+    locations_data = {}
+    held_items_data = []
+    pvp_data = {}
+
+    for pokemon in iter_json_array(filepath):
+        pokemon_name = get_pokemon_name(pokemon["name"])
+
+        obtainable_data[pokemon_name] = {"obtainable": pokemon.get("obtainable", False)}
+        moves_data[pokemon_name] = {"moves": pokemon.get("moves", [])}
+        locations_data[pokemon_name] = {
+            "locations": process_locations(pokemon.get("locations", []))
+        }
+        held_items_data.append(
+            {
+                "name": pokemon_name,
+                "id": pokemon["id"],
+                "held_items": pokemon.get("held_items", []),
+            }
+        )
+        if include_tiers:
+            pvp_name = pvp_name_change_lookup.get(pokemon_name, pokemon_name)
+            pvp_data[pvp_name] = {"pvp": [{"tier": get_pvp_tier(pokemon)}]}
+
+    # Read and apply the patch file
+    if os.path.exists(LOCATIONS_PATCH_FILE):
+        with open(LOCATIONS_PATCH_FILE, "r", encoding="utf-8") as patch_file:
+            apply_locations_patch(locations_data, json.load(patch_file))
+
+    # Merging custom Pokémon data
+    if include_tiers:
+        for pokemon_name, data in custom_pokemon_data.items():
+            pvp_data[pokemon_name] = data
+
+    return {
+        OBTAINABLE_FILE: obtainable_data,
+        MOVES_FILE: moves_data,
+        LOCATIONS_FILE: locations_data,
+        HELD_ITEMS_FILE: held_items_data,
+        **({PVP_DATA_FILE: pvp_data} if include_tiers else {}),
+    }
+
+
+def save_json_file(data, file_path):
+    with open(file_path, "w", encoding="utf-8") as outfile:
+        json.dump(data, outfile, ensure_ascii=False, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates the files taken from the client dump.")
+    parser.add_argument(
+        "--tiers",
+        action="store_true",
+        help="Also write pokemon-pvp-data.json from the tiers in the dump.",
+    )
+    args = parser.parse_args()
+
+    for file_path, data in ingest_monsters(MONSTERS_FILE, args.tiers).items():
+        save_json_file(data, file_path)
+        print(f"Saved {file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,16 @@
+import argparse
 import json
 import os
+import re
+import sys
 
 # File paths
 current_dir = os.path.dirname(os.path.abspath(__file__))
 DATA_SAVE_PATH = "./data/"
 DUMP_SAVE_PATH = os.path.join(current_dir, "dump/")
-INPUT_FILE = os.path.join(DATA_SAVE_PATH, "pokemon-data.json")
 EGG_MOVES_FILE = os.path.join(DUMP_SAVE_PATH, "20230429_egg_moves.txt")
 OUTPUT_FILE = os.path.join(DATA_SAVE_PATH, "egg-moves-data.json")
 
-# Load Pokémon data
-with open(INPUT_FILE, encoding="utf-8") as f:
-    pokemon_data = json.load(f)
-
 # Name change lookup
 name_change_lookup = {
     'nidoran♀': 'nidoran-f',
@@ -25,39 +23,124 @@ name_change_lookup = {
     # Add more name mappings as needed
 }
 
-# Function to clean up Pokémon names and moves from the line and apply name changes if necessary
+# Learn method annotations in the dump, e.g. "Togepi(BABY)(Egg)"; "(Lv.28)" is "level"
+learn_method_lookup = {
+    "Egg": "egg",
+    "Special": "special",
+    "BABY": "baby",
+    "Evolve": "evolve",
+    "PreEvolve": "pre-evolve",
+    "Egg&Item": "egg-item",
+}
+
+# One part of a line, e.g. "Bulbasaur[Petal Dance]", "Sunflora(Lv.28)" or
+# "Togepi(BABY)(Egg)": the Pokémon, the move (only in the first part) and its learn methods
+EGG_MOVE_STEP_PATTERN = re.compile(
+    r"(?P<name>[^\[(]+?)\s*(?:\[(?P<move>[^\]]*)\])?(?:\((?P<methods>.*)\))?"
+)
+
+
+# Function to clean up Pokémon names and apply name changes if necessary
 def clean_name(name):
-    cleaned_name = name.split('(')[0].strip().lower()
-    return name_change_lookup.get(cleaned_name, cleaned_name)
-
-# Parse egg moves file and construct the desired structure
-egg_moves = {}
-with open(EGG_MOVES_FILE, "r", encoding="utf-8") as file:
-    for line in file:
-        # Splitting line into move and chain of acquisition
-        parts = line.strip().split(" <= ")
-        pokemon, move = parts[0].split("[")
-        pokemon = clean_name(pokemon)  # Clean and lowercase pokemon name, apply name changes
-        move = move.rstrip("]")  # Remove closing bracket from move
-
-        # Initialize an empty list to store the chain
-        chain = []
-        # Iterate over all parts of the chain to clean names and apply changes
-        for part in parts[1:]:
-            chain.extend([clean_name(p) for p in part.split(" <= ")])  # Split on " <= " and clean each name
-
-        # Prepend the original Pokémon to the chain
-        chain.insert(0, pokemon)
-
-        # Ensure pokemon entry exists
-        if pokemon not in egg_moves:
-            egg_moves[pokemon] = {}
-
-        # Ensure move entry exists and append the chain
-        egg_moves[pokemon].setdefault(move, []).append(chain)
-
-# Save the structured egg moves data to a JSON file
-with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-    json.dump(egg_moves, f, ensure_ascii=False, indent=4)
-
-print("Egg moves data generated successfully.")
+    cleaned_name = name.strip().lower()
+    return sys.intern(name_change_lookup.get(cleaned_name, cleaned_name))
+
+
+def get_learn_method(method):
+    return sys.intern(learn_method_lookup.get(method, method.lower()))
+
+
+def parse_step(text):
+    """Returns (move, (name, learn methods, level)) for one part of a line.
+
+    The move is None except in the first part, and None is returned for text that
+    isn't a part of an egg move line.
+    """
+    match = EGG_MOVE_STEP_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    methods = []
+    level = None
+    if match["methods"] is not None:
+        for method in match["methods"].split(")("):
+            if method.startswith("Lv."):
+                methods.append("level")
+                level = int(method[3:])
+            else:
+                methods.append(get_learn_method(method))
+    move = sys.intern(match["move"]) if match["move"] is not None else None
+    return move, (clean_name(match["name"]), tuple(methods), level)
+
+
+def iter_egg_move_chains(file_path):
+    """Yields (pokemon, move, chain) for each line of an egg moves dump.
+
+    The chain is a tuple of (name, learn methods, level) steps starting with the
+    Pokémon itself, e.g. ("sunflora", ("level",), 28). The file is read a line at a
+    time and every distinct part of a line is only parsed once, so equal steps and
+    names are shared between chains.
+    """
+    parsed_steps = {}
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            steps = []
+            for part in line.strip().split(" <= "):
+                if part not in parsed_steps:
+                    parsed_steps[part] = parse_step(part)
+                steps.append(parsed_steps[part])
+            if steps[0] is None or steps[0][0] is None:
+                continue  # Not an egg move line
+            if None in steps:
+                print(f"Skipping unreadable egg move line: {line.strip()}")
+                continue
+            move, (pokemon, _, _) = steps[0]
+            yield pokemon, move, tuple(step for _, step in steps)
+
+
+def get_step_data(step):
+    name, methods, level = step
+    step_data = {"name": name}
+    if methods:
+        step_data["methods"] = list(methods)
+    if level is not None:
+        step_data["level"] = level
+    return step_data
+
+
+def build_egg_moves(egg_move_chains, learn_methods=False):
+    """Groups chains by Pokémon and move, as lists of names or with learn_methods as steps."""
+    egg_moves = {}
+    for pokemon, move, chain in egg_move_chains:
+        if learn_methods:
+            chain_data = [get_step_data(step) for step in chain]
+        else:
+            chain_data = [name for name, _, _ in chain]
+        egg_moves.setdefault(pokemon, {}).setdefault(move, []).append(chain_data)
+    return egg_moves
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generates egg-moves-data.json from the egg moves dump."
+    )
+    parser.add_argument(
+        "--learn-methods",
+        action="store_true",
+        help=(
+            "Save every Pokemon in a chain as an object with how it learns the move, "
+            'e.g. {"name": "sunflora", "methods": ["level"], "level": 28}.'
+        ),
+    )
+    args = parser.parse_args()
+
+    egg_moves = build_egg_moves(iter_egg_move_chains(EGG_MOVES_FILE), args.learn_methods)
+
+    # Save the structured egg moves data to a JSON file
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(egg_moves, f, ensure_ascii=False, indent=4)
+
+    print("Egg moves data generated successfully.")
+
+
+if __name__ == "__main__":
+    main()
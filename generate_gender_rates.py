@@ -1,5 +1,5 @@
-import json
-import os
+from data_store import DataStore
+from reverse_index import build_reverse_index
 
 # Constants
 DATA_SAVE_PATH = "./data/"
@@ -137,38 +137,40 @@ GENDER_RATE_MAPPING = {
 }
 
 
-def read_json_file(file_path):
-    """Reads a JSON file and returns its content."""
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+# Gender rate -> Pokémon with that gender rate
+GENDER_RATE_INDEX = {"keys": lambda pokemon_name, pokemon_info: [pokemon_info.get("gender_rate")]}
 
 
-def update_gender_rates_with_pokemon(pokemon_data, gender_rates):
-    """Updates gender rates with the Pokémon that have each gender rate."""
-    for pokemon_name, pokemon_info in pokemon_data.items():
-        gender_rate = pokemon_info.get("gender_rate")
+def add_gender_rate_pokemon(gender_rates, gender_rate_pokemon):
+    """Adds a GENDER_RATE_INDEX index to the gender rates."""
+    for gender_rate, pokemon_list in gender_rate_pokemon.items():
         if gender_rate in gender_rates:
-            gender_rates[gender_rate]["pokemon_list"].append({"name": pokemon_name, "id": pokemon_info["id"]})
+            gender_rates[gender_rate]["pokemon_list"].extend(pokemon_list)
     return gender_rates
 
 
-def save_json_file(data, file_path):
-    """Saves data to a JSON file."""
-    if not os.path.exists(DATA_SAVE_PATH):
-        os.makedirs(DATA_SAVE_PATH)
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
+def update_gender_rates_with_pokemon(pokemon_data, gender_rates):
+    """Updates gender rates with the Pokémon that have each gender rate."""
+    gender_rate_pokemon = build_reverse_index(pokemon_data.items(), GENDER_RATE_INDEX)
+    return add_gender_rate_pokemon(gender_rates, gender_rate_pokemon)
 
 
-def main():
+def run(store):
+    """Writes the gender rates of the Pokémon in the store."""
     # Load data from files
-    pokemon_data = read_json_file(POKEMON_DATA_FILE)
+    pokemon_data = store.load(POKEMON_DATA_FILE)
     
     # Update gender rates with the Pokémon that have each gender rate
     updated_gender_rates = update_gender_rates_with_pokemon(pokemon_data, GENDER_RATE_MAPPING)
     
     # Save the updated gender rates data
-    save_json_file(updated_gender_rates, DATA_SAVE_PATH + OUTPUT_FILE)
+    store.save(DATA_SAVE_PATH + OUTPUT_FILE, updated_gender_rates)
+
+
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
 
 
 if __name__ == "__main__":
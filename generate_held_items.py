@@ -1,5 +1,7 @@
 import json
 import os
+from data_store import DataStore
+from reverse_index import build_reverse_index
 
 # Constants
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -7,29 +9,15 @@ info_directory = os.path.join(current_dir, "dump", "info")
 data_directory = os.path.join(current_dir, "..", "data")
 POKEMON_DATA_FILE = os.path.join(data_directory, 'pokemon-data.json')
 ITEM_DATA_FILE = os.path.join(data_directory, 'item-data.json')
-MONSTERS_FILE = os.path.join(info_directory, 'monsters.json')
 ITEMS_FILE = os.path.join(info_directory, "items.json")
-
-# Add your lookup dictionary here for renaming pokemon if needed
-name_change_lookup = {
-    "nidoran♀": "nidoran-f",
-    "nidoran♂": "nidoran-m",
-    "farfetch'd": "farfetchd",
-    "mr. mime": "mr-mime",
-    "mime jr.": "mime-jr",
-    # Add more name mappings as needed
-}
+# Name, ID and held items of each Pokémon in the monsters dump, written by generate_dump_data.py
+HELD_ITEMS_FILE = os.path.join(current_dir, 'pokemon_held_items.json')
 
 def read_json_file(file_path):
     """ Reads a JSON file and returns its content. """
     with open(file_path, 'r', encoding='utf-8') as file:
         return json.load(file)
 
-def save_json_file(data, file_path):
-    """ Saves data to a JSON file. """
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
-
 def process_item_data(raw_data):
     """Processes and structures item data."""
     processed_data = {
@@ -54,10 +42,7 @@ def process_items(items):
 def update_pokemon_with_held_items(pokemon_data, monsters_data):
     """ Updates pokemon data with the held items information. """
     for pokemon in monsters_data:
-        pokemon_name = pokemon["name"].lower()
-        if pokemon_name in name_change_lookup:
-            pokemon_name = name_change_lookup[pokemon_name]
-
+        pokemon_name = pokemon["name"]
         if pokemon_name in pokemon_data:
             pokemon_data[pokemon_name]["held_items"] = []
             for item in pokemon.get("held_items", []):
@@ -69,41 +54,45 @@ def update_pokemon_with_held_items(pokemon_data, monsters_data):
 
     return pokemon_data
 
+def get_item_name(item):
+    return item["name"].replace(" ", "-").lower()
+
+# Held item name -> Pokémon in the monsters dump that can hold the item
+POKEMON_WITH_ITEM_INDEX = {
+    'keys': lambda pokemon_name, pokemon: [get_item_name(item) for item in pokemon.get("held_items", [])],
+}
+
 def update_items_with_pokemon(monsters_data, item_data):
     """ Updates item data with the Pokémon that can hold each item. """
+    pokemon_with_item = build_reverse_index(
+        ((pokemon["name"], pokemon) for pokemon in monsters_data),
+        POKEMON_WITH_ITEM_INDEX
+    )
+    item_ids = {}
     for pokemon in monsters_data:
-        pokemon_name = pokemon["name"].lower()
-        if pokemon_name in name_change_lookup:
-            pokemon_name = name_change_lookup[pokemon_name]
-
         for item in pokemon.get("held_items", []):
-            item_name = item["name"].replace(" ", "-").lower()
-            if item_name in item_data:
-                if 'pokemon_with_item' not in item_data[item_name]:
-                    item_data[item_name]['pokemon_with_item'] = []
-                item_data[item_name]['pokemon_with_item'].append({
-                    'name': pokemon_name,
-                    'id': pokemon['id']
-                })
-            else:
-                item_data[item_name] = {
-                    'id': item['id'],
-                    'name': item_name,
-                    'pokemon_with_item': [
-                        {
-                            'name': pokemon_name,
-                            'id': pokemon['id']
-                        }
-                    ]
-                }
+            item_ids.setdefault(get_item_name(item), item['id'])
+
+    for item_name, pokemon_list in pokemon_with_item.items():
+        if item_name in item_data:
+            if 'pokemon_with_item' not in item_data[item_name]:
+                item_data[item_name]['pokemon_with_item'] = []
+            item_data[item_name]['pokemon_with_item'].extend(pokemon_list)
+        else:
+            item_data[item_name] = {
+                'id': item_ids[item_name],
+                'name': item_name,
+                'pokemon_with_item': pokemon_list
+            }
 
     return item_data
 
-def main():
+def run(store):
+    """ Adds the held items to the Pokémon and item data in the store. """
     # Load data from files
-    pokemon_data = read_json_file(POKEMON_DATA_FILE)
-    item_data = read_json_file(ITEM_DATA_FILE)
-    monsters_data = read_json_file(MONSTERS_FILE)
+    pokemon_data = store.load(POKEMON_DATA_FILE)
+    item_data = store.load(ITEM_DATA_FILE)
+    monsters_data = read_json_file(HELD_ITEMS_FILE)
     raw_items = read_json_file(ITEMS_FILE)
 
     # Process raw items to match item-data.json structure
@@ -121,8 +110,13 @@ def main():
     updated_item_data = update_items_with_pokemon(monsters_data, item_data)
 
     # Save the updated data back to the files
-    save_json_file(updated_pokemon_data, POKEMON_DATA_FILE)
-    save_json_file(updated_item_data, ITEM_DATA_FILE)
+    store.save(POKEMON_DATA_FILE, updated_pokemon_data)
+    store.save(ITEM_DATA_FILE, updated_item_data)
+
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
 
 if __name__ == "__main__":
     main()
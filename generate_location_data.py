@@ -1,11 +1,17 @@
-import json
+import argparse
 import os
 import re
+from data_store import DataStore
 
-
-def read_pokemon_data(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        return json.load(file)
+# Encounter field that each grouped view is keyed by, by the file it is saved to
+ENCOUNTER_GROUPS = {
+    "location-rarities.json": "rarity",
+    "location-regions.json": "region_name",
+    "location-types.json": "type",
+}
+# With --shared-encounters every encounter is saved once in this file and the
+# other files list the index of the encounter in it instead of a copy.
+ENCOUNTERS_FILE = "location-encounters.json"
 
 
 def generate_location_data(pokemon_data):
@@ -39,30 +45,71 @@ def generate_location_data(pokemon_data):
     return location_data
 
 
-def save_location_data(location_data, file_path):
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(location_data, file, ensure_ascii=False, indent=4)
+def group_encounters(location_data, shared_encounters=False):
+    """Groups the encounters of every location by each field in ENCOUNTER_GROUPS in one pass.
 
+    Returns the groups by file name and, with shared_encounters, the list of
+    encounters that location_data and the groups now refer to by index.
+    """
+    groups = {file_name: {} for file_name in ENCOUNTER_GROUPS}
+    encounters = []
+    for data in location_data.values():
+        references = []
+        for encounter in data.get("encounters", []):
+            reference = encounter
+            if shared_encounters:
+                reference = len(encounters)
+                encounters.append(encounter)
+                references.append(reference)
+            for file_name, field in ENCOUNTER_GROUPS.items():
+                groups[file_name].setdefault(encounter.get(field), []).append(reference)
+        if shared_encounters:
+            data["encounters"] = references
+    return groups, encounters
 
-def main():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
+
+def run(store, shared_encounters=False):
     data_save_path = "./data/"
     all_pokemon_file = "pokemon-data.json"
     location_file = "location-data.json"
 
     # Read the existing Pokémon data
     pokemon_data_path = os.path.join(data_save_path, all_pokemon_file)
-    pokemon_data = read_pokemon_data(pokemon_data_path)
+    pokemon_data = store.load(pokemon_data_path)
 
-    # Generate Location data
+    # Generate Location data and the rarity, region and type views of it
     location_data = generate_location_data(pokemon_data)
+    groups, encounters = group_encounters(location_data, shared_encounters)
 
     # Save the Location data to a JSON file
     location_data_path = os.path.join(data_save_path, location_file)
-    save_location_data(location_data, location_data_path)
-
+    store.save(location_data_path, location_data)
     print(f"Location data saved to {location_data_path}")
 
+    for file_name, group_data in groups.items():
+        group_data_path = os.path.join(data_save_path, file_name)
+        store.save(group_data_path, group_data)
+        print(f"Location data grouped by {ENCOUNTER_GROUPS[file_name]} saved to {group_data_path}")
+
+    if shared_encounters:
+        encounters_path = os.path.join(data_save_path, ENCOUNTERS_FILE)
+        store.save(encounters_path, encounters)
+        print(f"Encounters saved to {encounters_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates the location data files.")
+    parser.add_argument(
+        "--shared-encounters",
+        action="store_true",
+        help=f"Save each encounter once in {ENCOUNTERS_FILE} and refer to it by index.",
+    )
+    args = parser.parse_args()
+
+    store = DataStore()
+    run(store, args.shared_encounters)
+    store.flush()
+
 
 if __name__ == "__main__":
     main()
@@ -1,45 +1,47 @@
-import json
 import os
+from data_store import DataStore
+from reverse_index import build_reverse_index
 
+# "true" / "false" -> Pokémon that are or are not obtainable
+OBTAINABLE_INDEX = {
+    "keys": lambda pokemon, data: ["true" if data.get("obtainable", False) else "false"]
+}
 
-def read_pokemon_data(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        return json.load(file)
 
-
-def generate_obtainable_data(pokemon_data):
-    obtainable_data = {"true": [], "false": []}
-    for pokemon, data in pokemon_data.items():
-        obtainable = data.get("obtainable", False)
-        key = "true" if obtainable else "false"
-        # Include both name and ID in the appended data
-        obtainable_data[key].append({"name": pokemon, "id": data["id"]})
-    return obtainable_data
+def build_obtainable_data(obtainable_pokemon):
+    """Builds the obtainable data from an OBTAINABLE_INDEX index."""
+    return {"true": obtainable_pokemon.get("true", []), "false": obtainable_pokemon.get("false", [])}
 
 
-def save_obtainable_data(obtainable_data, file_path):
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(obtainable_data, file, ensure_ascii=False, indent=4)
+def generate_obtainable_data(pokemon_data):
+    obtainable_pokemon = build_reverse_index(pokemon_data.items(), OBTAINABLE_INDEX)
+    return build_obtainable_data(obtainable_pokemon)
 
 
-def main():
+def run(store):
     data_save_path = "./data/"
     input_file = "pokemon-data.json"
     output_file = "obtainable-data.json"
 
     # Read the Pokémon data
     pokemon_data_path = os.path.join(data_save_path, input_file)
-    pokemon_data = read_pokemon_data(pokemon_data_path)
+    pokemon_data = store.load(pokemon_data_path)
 
     # Generate obtainable data
     obtainable_data = generate_obtainable_data(pokemon_data)
 
     # Save the obtainable data to a JSON file
     obtainable_data_path = os.path.join(data_save_path, output_file)
-    save_obtainable_data(obtainable_data, obtainable_data_path)
+    store.save(obtainable_data_path, obtainable_data)
 
     print(f"Obtainable data saved to {obtainable_data_path}")
 
 
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
+
+
 if __name__ == "__main__":
     main()
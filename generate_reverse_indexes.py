@@ -0,0 +1,73 @@
+import os
+from add_pokemon_to_abilities import POKEMON_WITH_ABILITY_INDEX, add_pokemon_with_ability
+from add_pokemon_to_moves import LEARNED_BY_POKEMON_INDEX, add_learned_by_pokemon
+from data_store import DataStore
+from generate_gender_rates import GENDER_RATE_INDEX, GENDER_RATE_MAPPING, add_gender_rate_pokemon
+from generate_obtainable_data import OBTAINABLE_INDEX, build_obtainable_data
+from generate_pvp_data import PVP_TIER_INDEX
+from generate_types_data import TYPE_POKEMON_INDEX, build_types_data, fetch_type_translations
+from pokeapi_client import print_request_stats
+from reverse_index import build_reverse_indexes
+
+# Builds the outputs of add_pokemon_to_moves.py, add_pokemon_to_abilities.py,
+# generate_types_data.py, generate_gender_rates.py, generate_pvp_data.py and
+# generate_obtainable_data.py with one pass over pokemon-data.json.
+DATA_SAVE_PATH = "./data/"
+POKEMON_DATA_FILE = os.path.join(DATA_SAVE_PATH, "pokemon-data.json")
+MOVES_DATA_FILE = os.path.join(DATA_SAVE_PATH, "moves-data.json")
+ABILITIES_DATA_FILE = os.path.join(DATA_SAVE_PATH, "abilities-data.json")
+TYPES_FILE = os.path.join(DATA_SAVE_PATH, "types-data.json")
+GENDER_RATES_FILE = os.path.join(DATA_SAVE_PATH, "gender-rates.json")
+PVP_FILE = os.path.join(DATA_SAVE_PATH, "pvp-data.json")
+OBTAINABLE_FILE = os.path.join(DATA_SAVE_PATH, "obtainable-data.json")
+
+REVERSE_INDEXES = {
+    "learned_by_pokemon": LEARNED_BY_POKEMON_INDEX,
+    "pokemon_with_ability": POKEMON_WITH_ABILITY_INDEX,
+    "type_pokemon": TYPE_POKEMON_INDEX,
+    "gender_rate_pokemon": GENDER_RATE_INDEX,
+    "pvp_tiers": PVP_TIER_INDEX,
+    "obtainable_pokemon": OBTAINABLE_INDEX,
+}
+
+
+def run(store):
+    """Writes every reverse index of the Pokémon data in the store."""
+    pokemon_data = store.load(POKEMON_DATA_FILE)
+    moves_data = store.load(MOVES_DATA_FILE)
+    abilities_data = store.load(ABILITIES_DATA_FILE)
+
+    indexes = build_reverse_indexes(pokemon_data.items(), REVERSE_INDEXES)
+
+    store.save(
+        MOVES_DATA_FILE,
+        add_learned_by_pokemon(pokemon_data, moves_data, indexes["learned_by_pokemon"]),
+    )
+    store.save(
+        ABILITIES_DATA_FILE,
+        add_pokemon_with_ability(
+            pokemon_data, abilities_data, indexes["pokemon_with_ability"]
+        ),
+    )
+    translations = fetch_type_translations()
+    store.save(
+        TYPES_FILE, build_types_data(indexes["type_pokemon"], moves_data, translations)
+    )
+    store.save(
+        GENDER_RATES_FILE,
+        add_gender_rate_pokemon(GENDER_RATE_MAPPING, indexes["gender_rate_pokemon"]),
+    )
+    store.save(PVP_FILE, indexes["pvp_tiers"])
+    store.save(OBTAINABLE_FILE, build_obtainable_data(indexes["obtainable_pokemon"]))
+    print(f"Reverse indexes saved to {DATA_SAVE_PATH}")
+
+
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
+    print_request_stats()
+
+
+if __name__ == "__main__":
+    main()
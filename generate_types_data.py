@@ -1,8 +1,7 @@
-import json
 import os
-import requests
-import time
-from requests.exceptions import SSLError
+from data_store import DataStore
+from pokeapi_client import print_request_stats, request_with_retry
+from reverse_index import build_reverse_index
 
 # Constants
 BASE_URL = "https://pokeapi.co/api/v2/type/"
@@ -11,38 +10,14 @@ ALL_POKEMON_FILE = "pokemon-data.json"
 ALL_MOVES_FILE = "moves-data.json"
 TYPES_FILE = "types-data.json"
 
+# Type name -> Pokémon of that type
+TYPE_POKEMON_INDEX = {"keys": lambda pokemon, data: data.get("types", [])}
+
 # Ensure the data directory exists
 if not os.path.exists(DATA_SAVE_PATH):
     os.makedirs(DATA_SAVE_PATH)
 
 
-def request_with_retry(url):
-    while True:
-        try:
-            response = requests.get(url)
-            return response
-        except (SSLError, requests.exceptions.ReadTimeout) as e:
-            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
-                e
-            ) or isinstance(
-                e, requests.exceptions.ReadTimeout
-            ):
-                print(f"Encountered error: {e}. Retrying in 60 seconds...")
-                time.sleep(60)
-            else:
-                raise
-
-
-def read_pokemon_data(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        return json.load(file)
-
-
-def read_moves_data(file_path):
-    with open(file_path, "r", encoding="utf-8") as file:
-        return json.load(file)
-
-
 def fetch_type_translations():
     response = request_with_retry(BASE_URL)
     if response.status_code != 200:
@@ -69,13 +44,11 @@ def fetch_type_translations():
     return translations
 
 
-def generate_types_data(pokemon_data, moves_data, translations):
+def build_types_data(type_pokemon, moves_data, translations):
+    """Builds the types data from a TYPE_POKEMON_INDEX index."""
     types_data = {}
-    for pokemon, data in pokemon_data.items():
-        for poke_type in data.get("types", []):
-            if poke_type not in types_data:
-                types_data[poke_type] = {"pokemon": [], "moves": [], "name_translations": translations.get(poke_type, {})}
-            types_data[poke_type]["pokemon"].append({"name": pokemon, "id": data["id"]})
+    for poke_type, pokemon_list in type_pokemon.items():
+        types_data[poke_type] = {"pokemon": pokemon_list, "moves": [], "name_translations": translations.get(poke_type, {})}
 
     for move, data in moves_data.items():
         move_type = data.get("type")
@@ -85,20 +58,18 @@ def generate_types_data(pokemon_data, moves_data, translations):
     return types_data
 
 
-def save_types_data(types_data, file_path):
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump(types_data, file, ensure_ascii=False, indent=4)
-
+def generate_types_data(pokemon_data, moves_data, translations):
+    type_pokemon = build_reverse_index(pokemon_data.items(), TYPE_POKEMON_INDEX)
+    return build_types_data(type_pokemon, moves_data, translations)
 
-def main():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
 
+def run(store):
     # Read the existing Pokémon and Moves data
     pokemon_data_path = os.path.join(DATA_SAVE_PATH, ALL_POKEMON_FILE)
-    pokemon_data = read_pokemon_data(pokemon_data_path)
+    pokemon_data = store.load(pokemon_data_path)
 
     moves_data_path = os.path.join(DATA_SAVE_PATH, ALL_MOVES_FILE)
-    moves_data = read_moves_data(moves_data_path)
+    moves_data = store.load(moves_data_path)
 
     # Fetch type translations from PokeAPI
     translations = fetch_type_translations()
@@ -108,10 +79,17 @@ def main():
 
     # Save the Types data to a JSON file
     types_data_path = os.path.join(DATA_SAVE_PATH, TYPES_FILE)
-    save_types_data(types_data, types_data_path)
+    store.save(types_data_path, types_data)
 
     print(f"Types data saved to {types_data_path}")
 
 
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
+    print_request_stats()
+
+
 if __name__ == "__main__":
     main()
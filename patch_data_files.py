@@ -1,5 +1,9 @@
+import hashlib
 import json
 import os
+import pickle
+import re
+from data_store import DataStore
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 DATA_SAVE_PATH = "./data/"
@@ -9,6 +13,10 @@ ABILITIES_DATA_FILE = "abilities-data.json"
 ITEM_DATA_FILE = "item-data.json"
 MOVES_DATA_FILE = "moves-data.json"
 MOVES_PATCH_FILE = "patch_move-data.json"
+RENAMES_PATCH_FILE = "patch_renames.json"  # Renames applied to the Pokemon and ability data
+# Compiled patch files are kept by the hash of their contents
+PATCH_PLAN_CACHE_DIR = os.path.join(current_dir, ".cache", "patch-plans")
+PATCH_PLAN_VERSION = 2  # Increase when compile_patch changes
 
 
 def load_json(filename):
@@ -16,91 +24,219 @@ def load_json(filename):
         return json.load(file)
 
 
-def update_nested_key(data, key_path, value):
-    keys = key_path.split(".")
-    for key in keys[:-1]:
-        data = data.setdefault(key, {})
-    data[keys[-1]] = value
+def get_removal_field(items):
+    """Returns "id" or "name" if every item to remove has one, else None.
 
+    Equal items share that field, so only list items with a matching value have to
+    be compared in full.
+    """
+    for field in ("id", "name"):
+        if all(
+            isinstance(item, dict) and isinstance(item.get(field), (int, str))
+            for item in items
+        ):
+            return field
+    return None
 
-def apply_patch(original_data, patch_data):
+
+def compile_patch(patch_data):
+    """Compiles patch data into a plan of operations that can be applied directly.
+
+    Each operation is a dict holding the target entry, the kind of change and what
+    it needs ready to use: the list key of an add or remove, the split path of a
+    value to set, and for a remove the items to drop grouped by their "id" or "name".
+    """
+    plan = []
     for key, changes in patch_data.items():
         for change_key, value in changes.items():
+            operation = {"target": key, "change": change_key, "value": value}
             if "_add" in change_key:
-                list_key = change_key.replace("_add", "")
-                if list_key in original_data[key]:
-                    original_data[key][list_key].extend(value)
+                operation["kind"] = "add"
+                operation["list_key"] = change_key.replace("_add", "")
             elif "_remove" in change_key:
-                list_key = change_key.replace("_remove", "")
-                if list_key in original_data[key]:
-                    original_data[key][list_key] = [
+                operation["kind"] = "remove"
+                operation["list_key"] = change_key.replace("_remove", "")
+                operation["removal_field"] = get_removal_field(value)
+                if operation["removal_field"] is not None:
+                    removals = {}
+                    for item in value:
+                        removals.setdefault(item[operation["removal_field"]], []).append(item)
+                    operation["removals"] = removals
+            else:
+                operation["kind"] = "set"
+                operation["path"] = change_key.split(".")
+            plan.append(operation)
+    return plan
+
+
+def load_patch_plan(patch_file):
+    """Returns the compiled plan of a patch file, reusing the one cached for its contents."""
+    with open(patch_file, "rb") as file:
+        content = file.read()
+    cache_file = os.path.join(
+        PATCH_PLAN_CACHE_DIR,
+        f"{hashlib.sha256(content).hexdigest()}.v{PATCH_PLAN_VERSION}.pickle",
+    )
+    try:
+        with open(cache_file, "rb") as file:
+            return pickle.load(file)
+    except Exception:
+        pass  # Missing, truncated or stale, so compile the patch again
+
+    plan = compile_patch(json.loads(content))
+    os.makedirs(PATCH_PLAN_CACHE_DIR, exist_ok=True)
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as file:
+        pickle.dump(plan, file)
+    os.replace(temp_file, cache_file)
+    return plan
+
+
+def apply_patch_plan(original_data, plan):
+    """Applies a compiled patch and returns the operations that changed nothing."""
+    no_ops = []
+    for operation in plan:
+        entry = original_data.get(operation["target"])
+        value = operation["value"]
+        changed = False
+        if entry is None:
+            pass
+        elif operation["kind"] == "add":
+            if operation["list_key"] in entry and value:
+                entry[operation["list_key"]].extend(value)
+                changed = True
+        elif operation["kind"] == "remove":
+            if operation["list_key"] in entry:
+                items = entry[operation["list_key"]]
+                field = operation["removal_field"]
+                if field is None:
+                    kept_items = [item for item in items if item not in value]
+                else:
+                    removals = operation["removals"]
+                    kept_items = [
                         item
-                        for item in original_data[key][list_key]
-                        if item not in value
+                        for item in items
+                        if type(item) is not dict
+                        or item.get(field) not in removals
+                        or item not in removals[item[field]]
                     ]
-            elif "." in change_key:
-                update_nested_key(original_data[key], change_key, value)
-            else:
-                original_data[key][change_key] = value
+                entry[operation["list_key"]] = kept_items
+                changed = len(kept_items) != len(items)
+        else:
+            path = operation["path"]
+            for key in path[:-1]:
+                entry = entry.setdefault(key, {})
+            changed = path[-1] not in entry or entry[path[-1]] != value
+            entry[path[-1]] = value
+        if not changed:
+            no_ops.append(operation)
+    return no_ops
+
+
+def apply_patch(original_data, patch_data):
+    """Applies patch data and returns the operations that changed nothing."""
+    return apply_patch_plan(original_data, compile_patch(patch_data))
+
+
+def report_no_ops(patch_file, no_ops):
+    for operation in no_ops:
+        print(
+            f"Patch in {patch_file} had no effect: {operation['target']}.{operation['change']}"
+        )
+
+
+class RenameTable:
+    """A table of {old string: new string} renames compiled into a single regex.
+
+    Every rename is applied to the keys and string values of a document in one
+    traversal. Renames are applied side by side, so the output of one rename is
+    not renamed again, and the longest old string wins where several match.
+    """
 
+    def __init__(self, renames):
+        self.renames = dict(renames)
+        old_strings = sorted(self.renames, key=len, reverse=True)
+        self.pattern = re.compile("|".join(map(re.escape, old_strings))) if old_strings else None
 
-def replace_string_in_data(data, old_string, new_string):
+    def replace(self, match):
+        return self.renames[match.group(0)]
+
+    def apply(self, text):
+        return self.pattern.sub(self.replace, text)
+
+    def order_renamed_keys(self, keys):
+        """Orders renamed dict keys the way applying each rename in its own pass did.
+
+        Such a pass moved every key it renamed to the end of the dict, so the keys
+        end up grouped by the last rename that matched them.
+        """
+        current_keys = {key: key for key in keys}
+        for old_string, new_string in self.renames.items():
+            matching = [key for key in keys if old_string in current_keys[key]]
+            if matching:
+                keys = [key for key in keys if old_string not in current_keys[key]] + matching
+                for key in matching:
+                    current_keys[key] = current_keys[key].replace(old_string, new_string)
+        return keys
+
+
+def rename_strings_in_data(data, rename_table):
+    if rename_table.pattern is None:
+        return
     if isinstance(data, dict):
-        for key in list(
-            data.keys()
-        ):  # Use list to avoid RuntimeError due to change in dictionary size during iteration
-            new_key = key.replace(old_string, new_string) if old_string in key else key
-            value = data[key]
+        renamed_keys = []
+        for key, value in data.items():
             if isinstance(value, (dict, list)):
-                replace_string_in_data(value, old_string, new_string)
+                rename_strings_in_data(value, rename_table)
             elif isinstance(value, str):
-                value = value.replace(old_string, new_string)
+                data[key] = rename_table.apply(value)
+            if rename_table.pattern.search(key):
+                renamed_keys.append(key)
 
-            if new_key != key:
-                data[new_key] = value
-                del data[key]
-            else:
-                data[key] = value
+        # Renamed keys move to the end of the dict
+        for key in rename_table.order_renamed_keys(renamed_keys):
+            data[rename_table.apply(key)] = data.pop(key)
 
     elif isinstance(data, list):
         for i, item in enumerate(data):
             if isinstance(item, (dict, list)):
-                replace_string_in_data(item, old_string, new_string)
-            elif isinstance(item, str) and old_string in item:
-                data[i] = item.replace(old_string, new_string)
+                rename_strings_in_data(item, rename_table)
+            elif isinstance(item, str):
+                data[i] = rename_table.apply(item)
 
 
-def save_json(data, filename):
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
-
-
-def main():
+def run(store):
+    """Applies the patch files to the Pokemon, ability and move data in the store."""
     # Process Pokemon Data
-    pokemon_original_data = load_json(DATA_SAVE_PATH + POKEMON_DATA_FILE)
-    pokemon_patch_data = load_json(os.path.join(current_dir, POKEMON_PATCH_FILE))
+    pokemon_original_data = store.load(DATA_SAVE_PATH + POKEMON_DATA_FILE)
+    pokemon_patch_plan = load_patch_plan(os.path.join(current_dir, POKEMON_PATCH_FILE))
+    rename_table = RenameTable(load_json(os.path.join(current_dir, RENAMES_PATCH_FILE)))
 
-    apply_patch(pokemon_original_data, pokemon_patch_data)
-    replace_string_in_data(pokemon_original_data, "neutralizing-gas", "reactive-gas")
-    replace_string_in_data(pokemon_original_data, "slush-rush", "snow-plow")
-    save_json(pokemon_original_data, DATA_SAVE_PATH + POKEMON_DATA_FILE)
+    report_no_ops(POKEMON_PATCH_FILE, apply_patch_plan(pokemon_original_data, pokemon_patch_plan))
+    rename_strings_in_data(pokemon_original_data, rename_table)
+    store.save(DATA_SAVE_PATH + POKEMON_DATA_FILE, pokemon_original_data)
 
     # Process Abilities Data
-    abilities_data = load_json(DATA_SAVE_PATH + ABILITIES_DATA_FILE)
-    replace_string_in_data(abilities_data, "neutralizing-gas", "reactive-gas")
-    replace_string_in_data(abilities_data, "slush-rush", "snow-plow")
-    save_json(abilities_data, DATA_SAVE_PATH + ABILITIES_DATA_FILE)
+    abilities_data = store.load(DATA_SAVE_PATH + ABILITIES_DATA_FILE)
+    rename_strings_in_data(abilities_data, rename_table)
+    store.save(DATA_SAVE_PATH + ABILITIES_DATA_FILE, abilities_data)
 
     # Process Item Data
     # item_data = load_json(DATA_SAVE_PATH + ITEM_DATA_FILE)
-    # replace_string_in_data(item_data, "assault-vest", "assault-gear")
+    # rename_strings_in_data(item_data, RenameTable({"assault-vest": "assault-gear"}))
     # save_json(item_data, DATA_SAVE_PATH + ITEM_DATA_FILE)
 
     # Process Move Data
-    moves_original_data = load_json(DATA_SAVE_PATH + MOVES_DATA_FILE)
-    moves_patch_data = load_json(os.path.join(current_dir, MOVES_PATCH_FILE))
-    apply_patch(moves_original_data, moves_patch_data)
-    save_json(moves_original_data, DATA_SAVE_PATH + MOVES_DATA_FILE)
+    moves_original_data = store.load(DATA_SAVE_PATH + MOVES_DATA_FILE)
+    moves_patch_plan = load_patch_plan(os.path.join(current_dir, MOVES_PATCH_FILE))
+    report_no_ops(MOVES_PATCH_FILE, apply_patch_plan(moves_original_data, moves_patch_plan))
+    store.save(DATA_SAVE_PATH + MOVES_DATA_FILE, moves_original_data)
+
+
+def main():
+    store = DataStore()
+    run(store)
+    store.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,523 @@
+import atexit
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import requests
+from requests.exceptions import SSLError
+
+# Shared HTTP access for every script that talks to PokeAPI.
+#
+# Responses are kept in an on-disk cache so a rebuild does not have to download
+# the same documents again. Each entry is stored under the SHA-256 of its URL,
+# its age is taken from the file modification time and the oldest entries are
+# evicted once the cache grows past its size limit.
+#
+# Settings can be changed through environment variables so they also reach the
+# scripts started by generate_all_files.py:
+#   POKEAPI_CACHE            set to "0" to disable the cache
+#   POKEAPI_CACHE_DIR        directory holding the cached responses
+#   POKEAPI_CACHE_TTL        seconds before an entry is fetched again
+#   POKEAPI_CACHE_MAX_BYTES  size limit before the oldest entries are evicted
+#   POKEAPI_MAX_WORKERS      number of parallel downloads used by prefetch()
+#   POKEAPI_RATE_LIMIT       requests per second sent to PokeAPI, 0 for no limit
+#   POKEAPI_MIRROR_DIR       local copy of the PokeAPI api-data tree; when set, URLs
+#                            are read from its index.json files instead of the network
+#   POKEAPI_RECORD           zip archive that every response is added to at exit
+#   POKEAPI_REPLAY           zip archive recorded earlier; responses are only served
+#                            from it and a URL missing from it is an error
+#   POKEAPI_REQUEST_LOG      JSON file that the URL and content hash of every response
+#                            is written to at exit, used for incremental rebuilds
+current_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_ENABLED = os.environ.get("POKEAPI_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get(
+    "POKEAPI_CACHE_DIR", os.path.join(current_dir, ".cache", "pokeapi")
+)
+CACHE_TTL = int(os.environ.get("POKEAPI_CACHE_TTL", 7 * 24 * 60 * 60))
+CACHE_MAX_BYTES = int(os.environ.get("POKEAPI_CACHE_MAX_BYTES", 2 * 1024**3))
+CACHEABLE_STATUS_CODES = (200, 404)
+MAX_WORKERS = int(os.environ.get("POKEAPI_MAX_WORKERS", 8))
+RATE_LIMIT = float(os.environ.get("POKEAPI_RATE_LIMIT", 10))
+MIRROR_DIR = os.environ.get("POKEAPI_MIRROR_DIR")
+RECORD_ARCHIVE = os.environ.get("POKEAPI_RECORD")
+REPLAY_ARCHIVE = os.environ.get("POKEAPI_REPLAY")
+REQUEST_LOG = os.environ.get("POKEAPI_REQUEST_LOG")
+GENERATION_BASE_URL = "https://pokeapi.co/api/v2/generation/"
+SUPPORTED_GENERATIONS = range(1, 6)  # PokeMMO covers generations 1-5
+
+cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+request_counts = collections.Counter()  # Documents requested per API endpoint
+_cache_size = None
+_cache_lock = threading.Lock()
+_thread_local = threading.local()
+prefetched_responses = {}
+_prefetch_lock = threading.Lock()
+mirror_resource_ids = {}  # Resource name -> {entry name: ID} read from the mirror
+_mirror_lock = threading.Lock()
+recorded_responses = {}  # URL -> (status code, compressed body), saved at exit
+_replay_archive = None
+_archive_lock = threading.Lock()
+response_hashes = {} if REQUEST_LOG else None  # URL -> content hash of every response
+
+
+class TokenBucket:
+    """Blocks callers so that no more than `rate` requests per second are started."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+rate_limiter = TokenBucket(RATE_LIMIT)
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response served from a local copy."""
+
+    def __init__(self, url, content, status_code=200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def cache_key(url):
+    """Returns the cache address of a URL."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def cache_entry_path(url, status_code):
+    key = cache_key(url)
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.{status_code}")
+
+
+def read_cache(url):
+    """Returns the cached response for a URL, or None if it is missing or expired."""
+    for status_code in CACHEABLE_STATUS_CODES:
+        path = cache_entry_path(url, status_code)
+        try:
+            if time.time() - os.path.getmtime(path) > CACHE_TTL:
+                continue
+            with open(path, "rb") as file:
+                return CachedResponse(url, file.read(), status_code)
+        except OSError:
+            continue
+    return None
+
+
+def write_cache(url, response):
+    """Stores a response in the cache, evicting old entries if needed."""
+    global _cache_size
+    if response.status_code not in CACHEABLE_STATUS_CODES:
+        return
+    path = cache_entry_path(url, response.status_code)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(response.content)
+    try:
+        replaced_size = os.path.getsize(path)  # e.g. an entry refreshed after its TTL
+    except OSError:
+        replaced_size = 0
+    os.replace(temp_path, path)
+
+    with _cache_lock:
+        if _cache_size is None:
+            _cache_size = sum(size for _, size, _ in iter_cache_entries())
+        else:
+            _cache_size += len(response.content) - replaced_size
+        if _cache_size > CACHE_MAX_BYTES:
+            evict_cache_entries()
+
+
+def iter_cache_entries():
+    """Yields (path, size, mtime) for every entry in the cache."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for bucket in os.scandir(CACHE_DIR):
+        if not bucket.is_dir():
+            continue
+        for entry in os.scandir(bucket.path):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield entry.path, stat.st_size, stat.st_mtime
+
+
+def evict_cache_entries():
+    """Removes the oldest entries until the cache is back under 90% of its limit."""
+    global _cache_size
+    entries = sorted(iter_cache_entries(), key=lambda entry: entry[2])
+    _cache_size = sum(size for _, size, _ in entries)
+    target_size = CACHE_MAX_BYTES * 0.9
+    for path, size, _ in entries:
+        if _cache_size <= target_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        _cache_size -= size
+        cache_stats["evictions"] += 1
+
+
+def get_mirror_api_root():
+    """Returns the api/v2 directory of an api-data checkout or of its data folder."""
+    for api_root in (
+        os.path.join(MIRROR_DIR, "api", "v2"),
+        os.path.join(MIRROR_DIR, "data", "api", "v2"),
+    ):
+        if os.path.isdir(api_root):
+            return api_root
+    raise FileNotFoundError(f"No api/v2 directory found in mirror {MIRROR_DIR}")
+
+
+def get_url_segments(url):
+    """Splits an absolute or relative PokeAPI URL into the path segments after /api/v2/."""
+    path = url.split("/api/v2/", 1)[-1].split("?", 1)[0]
+    return [segment for segment in path.split("/") if segment]
+
+
+def read_mirror_file(segments):
+    path = os.path.join(get_mirror_api_root(), *segments, "index.json")
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def get_mirror_resource_id(resource, name):
+    """Looks up the ID of a named entry, since the mirror only stores entries by ID."""
+    with _mirror_lock:
+        if resource not in mirror_resource_ids:
+            content = read_mirror_file([resource])
+            results = json.loads(content)["results"] if content else []
+            mirror_resource_ids[resource] = {
+                entry["name"]: get_url_segments(entry["url"])[-1] for entry in results
+            }
+    return mirror_resource_ids[resource].get(name)
+
+
+def read_mirror(url):
+    """Serves a PokeAPI URL from the local mirror."""
+    segments = get_url_segments(url)
+    if len(segments) == 2 and not segments[1].isdigit():
+        resource_id = get_mirror_resource_id(segments[0], segments[1])
+        if resource_id is None:
+            return CachedResponse(url, b"Not Found", 404)
+        segments = [segments[0], resource_id]
+
+    content = read_mirror_file(segments)
+    if content is None:
+        return CachedResponse(url, b"Not Found", 404)
+    if len(segments) == 1:
+        # The mirror stores every entry of a list on one page.
+        resource_list = json.loads(content)
+        resource_list["next"] = None
+        resource_list["previous"] = None
+        content = json.dumps(resource_list).encode("utf-8")
+    return CachedResponse(url, content)
+
+
+def read_replay(url):
+    """Serves a URL from the replay archive."""
+    global _replay_archive
+    with _archive_lock:
+        if _replay_archive is None:
+            _replay_archive = zipfile.ZipFile(REPLAY_ARCHIVE)
+        try:
+            info = _replay_archive.getinfo(cache_key(url))
+        except KeyError:
+            raise LookupError(
+                f"No recorded response for {url} in {REPLAY_ARCHIVE}"
+            ) from None
+        content = _replay_archive.read(info)
+    status_code = int(info.comment.decode("utf-8").split(" ", 1)[0])
+    return CachedResponse(url, content, status_code)
+
+
+def lock_file(file):
+    """Waits until this process holds the lock of an open file.
+
+    The operating system drops the lock when the process exits, so a run that is
+    killed while holding it doesn't block later runs.
+    """
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        # Raises OSError if the lock is still held after about 10 seconds
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def unlock_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def save_recording():
+    """Adds the responses of this run to the record archive.
+
+    Several scripts may record into the same archive, so it is only opened while
+    holding the lock of a lock file next to it and responses that are already
+    stored are skipped.
+    """
+    if not recorded_responses:
+        return
+    with open(RECORD_ARCHIVE + ".lock", "a+b") as lock:
+        lock_file(lock)
+        try:
+            with zipfile.ZipFile(
+                RECORD_ARCHIVE, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=9
+            ) as archive:
+                stored_names = set(archive.namelist())
+                for url, (status_code, content) in recorded_responses.items():
+                    info = zipfile.ZipInfo(cache_key(url))
+                    if info.filename in stored_names:
+                        continue
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.comment = f"{status_code} {url}".encode("utf-8")
+                    archive.writestr(info, zlib.decompress(content))
+        finally:
+            unlock_file(lock)
+    print(f"Recorded {len(recorded_responses)} responses to {RECORD_ARCHIVE}.")
+
+
+if RECORD_ARCHIVE:
+    atexit.register(save_recording)
+
+
+def get_response_hash(response):
+    digest = hashlib.sha256(f"{response.status_code} ".encode("utf-8"))
+    digest.update(response.content)
+    return digest.hexdigest()
+
+
+def get_local_response_hash(url):
+    """Returns the hash of the response a URL would get without downloading it.
+
+    None is returned when the response is not available locally, e.g. when the
+    cache entry is missing or expired.
+    """
+    if REPLAY_ARCHIVE:
+        try:
+            response = read_replay(url)
+        except LookupError:
+            return None
+    elif MIRROR_DIR:
+        response = read_mirror(url)
+    elif CACHE_ENABLED:
+        response = read_cache(url)
+        if response is None:
+            return None
+    else:
+        return None
+    return get_response_hash(response)
+
+
+def save_request_log():
+    with open(REQUEST_LOG, "w", encoding="utf-8") as file:
+        json.dump(response_hashes, file, ensure_ascii=False, indent=4)
+
+
+if REQUEST_LOG:
+    atexit.register(save_request_log)
+
+
+def log_responses(response_log):
+    """Keeps the URL and content hash of every following response in response_log.
+
+    This is the in-process counterpart of POKEAPI_REQUEST_LOG, used by
+    generate_all_files.py for stages it runs itself. Pass None to stop.
+    """
+    global response_hashes
+    response_hashes = response_log
+
+
+def set_rate_limit(rate):
+    """Changes the requests per second of this process, 0 for no limit."""
+    global rate_limiter
+    rate_limiter = TokenBucket(rate)
+
+
+def get_session():
+    """Returns a per-thread session so connections to PokeAPI are reused."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
+def fetch(url):
+    while True:
+        rate_limiter.acquire()
+        try:
+            response = get_session().get(url)
+            return response
+        except (SSLError, requests.exceptions.ReadTimeout) as e:
+            if "[SSL: UNEXPECTED_EOF_WHILE_READING] EOF occurred in violation of protocol" in str(
+                e
+            ) or isinstance(
+                e, requests.exceptions.ReadTimeout
+            ):
+                print(f"Encountered error: {e}. Retrying in 60 seconds...")
+                time.sleep(60)
+            else:
+                raise
+
+
+def get_endpoint(url):
+    """Returns the API resource name of a URL, e.g. "pokemon-form"."""
+    segments = get_url_segments(url)
+    return segments[0] if segments else url
+
+
+def request_with_retry(url):
+    """Fetches a URL, serving it from prefetched responses or the cache when possible."""
+    with _prefetch_lock:
+        prefetched_response = prefetched_responses.pop(url, None)
+    if prefetched_response is not None:
+        return prefetched_response
+
+    with _cache_lock:
+        request_counts[get_endpoint(url)] += 1
+
+    if REPLAY_ARCHIVE:
+        response = read_replay(url)
+    else:
+        response = load_response(url)
+        if RECORD_ARCHIVE:
+            recorded_response = (response.status_code, zlib.compress(response.content))
+            with _archive_lock:
+                recorded_responses[url] = recorded_response
+    if response_hashes is not None:
+        response_hash = get_response_hash(response)
+        with _archive_lock:
+            response_hashes[url] = response_hash
+    return response
+
+
+def load_response(url):
+    if MIRROR_DIR:
+        return read_mirror(url)
+
+    if CACHE_ENABLED:
+        cached_response = read_cache(url)
+        if cached_response is not None:
+            with _cache_lock:
+                cache_stats["hits"] += 1
+            return cached_response
+        with _cache_lock:
+            cache_stats["misses"] += 1
+
+    response = fetch(url)
+    if CACHE_ENABLED:
+        write_cache(url, response)
+    return response
+
+
+def prefetch(urls, keep=True):
+    """Downloads URLs in parallel and returns the responses as a dict keyed by URL.
+
+    This waits until every URL has been downloaded. With keep, the responses are
+    also kept for request_with_retry, which hands each of them out once, so the
+    calling script can then walk its data in the usual order without waiting on
+    each request. Callers that use the returned responses themselves pass
+    keep=False.
+    """
+    with _prefetch_lock:
+        pending = list(
+            dict.fromkeys(url for url in urls if url not in prefetched_responses)
+        )
+    responses = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for url, response in zip(pending, executor.map(request_with_retry, pending)):
+            responses[url] = response
+    if keep:
+        with _prefetch_lock:
+            prefetched_responses.update(responses)
+    return responses
+
+
+def get_generation_resource_names(resource, generations=SUPPORTED_GENERATIONS):
+    """Returns {name: ID} of the entries a resource gained in the given generations.
+
+    The resource is a list in the generation documents, e.g. "moves", "abilities" or
+    "pokemon_species", so this needs one request per generation instead of one per
+    entry. Returns None if a generation could not be fetched.
+    """
+    names = {}
+    for generation in generations:
+        response = request_with_retry(f"{GENERATION_BASE_URL}{generation}")
+        if response.status_code != 200:
+            print(f"Failed to fetch generation {generation}: HTTP {response.status_code}")
+            return None
+        for entry in response.json().get(resource, []):
+            names[entry["name"]] = int(get_url_segments(entry["url"])[-1])
+    return names
+
+
+def print_request_stats():
+    total_requests = sum(request_counts.values())
+    endpoint_counts = ", ".join(
+        f"{endpoint} {count}" for endpoint, count in sorted(request_counts.items())
+    )
+    print(f"PokeAPI requests: {total_requests} ({endpoint_counts})")
+    if REPLAY_ARCHIVE:
+        print(f"PokeAPI responses replayed from {REPLAY_ARCHIVE}.")
+        return
+    if MIRROR_DIR:
+        print(f"PokeAPI responses read from mirror {MIRROR_DIR}.")
+        return
+    if not CACHE_ENABLED:
+        print("PokeAPI cache disabled.")
+        return
+    print(
+        f"PokeAPI cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['evictions']} evictions."
+    )
@@ -0,0 +1,34 @@
+# Builds "which Pokémon have X" lists, e.g. the Pokémon that learn each move or
+# that are in each PvP tier, for several outputs in one pass over the data.
+#
+# An index is described by a dict:
+#   "keys"    function (name, data) -> the keys a record is listed under, e.g. the
+#             IDs of the moves a Pokémon learns
+#   "unique"  when true a record is listed once per key, matched by its "id"
+# Every key maps to a list of {"name", "id"} entries in record order, and the keys
+# are kept in the order they were first seen.
+
+
+def build_reverse_indexes(records, specs):
+    """Builds every index in specs with a single pass over (name, data) records.
+
+    Returns a dict with the index of each spec under the same name.
+    """
+    indexes = {index_name: {} for index_name in specs}
+    listed_ids = {index_name: {} for index_name in specs}
+    for name, data in records:
+        for index_name, spec in specs.items():
+            index = indexes[index_name]
+            for key in spec["keys"](name, data):
+                if spec.get("unique"):
+                    key_ids = listed_ids[index_name].setdefault(key, set())
+                    if data["id"] in key_ids:
+                        continue
+                    key_ids.add(data["id"])
+                index.setdefault(key, []).append({"name": name, "id": data["id"]})
+    return indexes
+
+
+def build_reverse_index(records, spec):
+    """Builds a single index, see build_reverse_indexes."""
+    return build_reverse_indexes(records, {"index": spec})["index"]